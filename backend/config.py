@@ -21,6 +21,8 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 # Resolve paths relative to this file so the app works from any cwd.
 _BACKEND_DIR = Path(__file__).parent.resolve()
 _DEFAULT_CSV = str(_BACKEND_DIR / "data" / "job_roles.csv")
+_DEFAULT_SPAN_LOG = str(_BACKEND_DIR / "logs" / "spans.jsonl")
+_DEFAULT_QUERY_SKETCH = str(_BACKEND_DIR / "state" / "query_sketch.json")
 
 
 class Settings(BaseSettings):
@@ -33,6 +35,70 @@ class Settings(BaseSettings):
     csv_path: str = _DEFAULT_CSV
     tfidf_ngram_min: int = 1
     tfidf_ngram_max: int = 2
+    # Compact mode: float32 X / IDF and a packed vocabulary (see ml/compact.py)
+    model_compact: bool = False
+    # "sparse" | "dense" | "auto" — auto goes dense when rows × vocab is small.
+    # Scoring path precedence: score_shards > 1, else the dense matrix when
+    # the layout resolves to dense, else variant scoring, else sparse X.
+    model_layout: str = "auto"
+    dense_max_cells: int = 500_000
+    # Role-to-role index: neighbours kept per role, and the dense-cell bound
+    # for each X @ X.T block computed while building it
+    similar_roles_k: int = 5
+    similar_block_cells: int = 4_000_000
+    # Score Junior / Senior / … variants through one shared vector per family
+    # (sparse layout only — the dense matvec is already the faster path)
+    variant_scoring: bool = True
+    # > 1 scores X in that many row shards on a "thread" or "process" pool
+    # and merges per-shard top-k (large catalogs; overrides variant_scoring)
+    score_shards: int = 0
+    shard_executor: str = "thread"
+
+    # ── Named datasets ───────────────────────────────────────────────────────
+    # csv_path is served as `default_dataset`; more catalogs are listed as
+    # comma-separated name=path pairs, e.g. "us=data/us.csv,emea=data/emea.csv".
+    # Non-default datasets load on first use and are evicted LRU once the
+    # loaded models exceed the memory budget.
+    default_dataset: str = "default"
+    datasets: str = ""
+    dataset_memory_budget_mb: float = 512.0
+
+    # ── Resume upload ────────────────────────────────────────────────────────
+    resume_chunk_bytes: int = 64 * 1024
+    resume_max_bytes: int = 5 * 1024 * 1024
+
+    # ── Scoring sessions ─────────────────────────────────────────────────────
+    # Idle sessions expire after session_ttl_seconds; beyond the memory cap
+    # the least recently used ones are dropped.
+    session_ttl_seconds: float = 1800.0
+    session_memory_mb: float = 64.0
+
+    # ── Response cache & warmup ──────────────────────────────────────────────
+    # /recommend responses are cached per loaded model (LRU, entries per
+    # dataset).  Request frequencies go into a count-min + top-K sketch saved
+    # every query_sketch_save_seconds; after a (re)load the hottest queries
+    # are precomputed in the background for up to warmup_budget_seconds —
+    # before serving when warmup_blocking is set.
+    response_cache_size: int = 1024
+    query_sketch_path: str = _DEFAULT_QUERY_SKETCH
+    query_sketch_width: int = 2048
+    query_sketch_depth: int = 4
+    query_sketch_top_k: int = 200
+    query_sketch_save_seconds: float = 60.0
+    warmup_budget_seconds: float = 10.0
+    warmup_blocking: bool = False
+
+    # ── Tracing ──────────────────────────────────────────────────────────────
+    # Requests slower than trace_slow_ms are always written to the span log;
+    # faster ones with probability trace_sample_rate.  trace_exporter swaps
+    # the local JSONL writer for any SpanExporter ("package.module:Class").
+    tracing_enabled: bool = True
+    trace_slow_ms: float = 250.0
+    trace_sample_rate: float = 0.0
+    trace_log_path: str = _DEFAULT_SPAN_LOG
+    trace_log_max_bytes: int = 10 * 1024 * 1024
+    trace_log_backups: int = 5
+    trace_exporter: str = ""
 
     # ── Server ───────────────────────────────────────────────────────────────
     host: str = "0.0.0.0"
@@ -49,6 +115,11 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    @property
+    def extra_datasets(self) -> dict[str, str]:
+        pairs = (p.split("=", 1) for p in self.datasets.split(",") if "=" in p)
+        return {name.strip(): path.strip() for name, path in pairs}
+
     @property
     def allowed_origins(self) -> list[str]:
         return [o.strip() for o in self.cors_origins.split(",")]
@@ -19,29 +19,73 @@ Or via the convenience script at the repo root:
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 import math
 from contextlib import asynccontextmanager
+from typing import Iterator, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, status
+import pandas as pd
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from pydantic import ValidationError
 
 from backend.config import settings
 from backend.ml.logic import (
+    RESOURCE_DB,
     generate_4_week_plan,
     get_mini_projects,
     get_resources_for_skills,
     get_strengths_and_missing,
     recommend,
+    skill_uplift_scores,
 )
-from backend.ml.model import MLModel, model as _global_model
+from backend.ml.model import MLModel
+from backend.ml.registry import DatasetRegistry, DatasetUnavailable
+from backend.ml.sessions import ScoringSession, SessionStore
+from backend.tracing import (
+    JsonlFileExporter,
+    TracingMiddleware,
+    load_exporter,
+    set_trace_attributes,
+    span,
+    tracer,
+)
+from backend.uploads import (
+    FORM_OVERHEAD_BYTES,
+    MalformedUpload,
+    ResumeUpload,
+    UnsupportedUpload,
+    UploadTooLarge,
+    multipart_boundary,
+)
+from backend.warmup import CacheWarmer, QuerySketch, ResponseCache
 from backend.schemas import (
+    DEFAULT_ROLE_FIELDS,
+    DatasetInfo,
+    DatasetsResponse,
     HealthResponse,
     LOW_CONFIDENCE_THRESHOLD,
+    MAX_SKILLS_LENGTH,
+    RankedRole,
     RecommendRequest,
     RecommendResponse,
+    ResumeOptions,
     RoleRecommendation,
+    SessionCreateRequest,
+    SessionResponse,
+    SessionUpdateRequest,
+    SimilarRole,
+    SimilarRolesResponse,
+    SkillSuggestResponse,
+    SkillUplift,
+    WarmupStatus,
+    WhatIfRequest,
+    WhatIfResponse,
 )
 
 # ---------------------------------------------------------------------------
@@ -59,13 +103,123 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load ML artefacts before serving any request."""
+    """Register datasets and load the default one before serving any request."""
+    if settings.tracing_enabled:
+        tracer.configure(
+            exporter=(
+                load_exporter(settings.trace_exporter) if settings.trace_exporter
+                else JsonlFileExporter(
+                    settings.trace_log_path,
+                    max_bytes=settings.trace_log_max_bytes,
+                    backup_count=settings.trace_log_backups,
+                )
+            ),
+            slow_ms=settings.trace_slow_ms,
+            sample_rate=settings.trace_sample_rate,
+        )
+    query_sketch.load(settings.query_sketch_path)
+    registry.register(settings.default_dataset, settings.csv_path, pinned=True, builtin_fallback=True)
+    for name, csv_path in settings.extra_datasets.items():
+        registry.register(name, csv_path)
     logger.info("Loading ML model from: %s", settings.csv_path)
-    _global_model.load(settings.csv_path)
+    registry.get(settings.default_dataset)     # also starts the cache warmup
+    if settings.warmup_blocking:
+        await run_in_threadpool(
+            warmer.wait, settings.default_dataset, settings.warmup_budget_seconds + 1.0
+        )
     logger.info("ML model loaded and ready.")
+    persist_task = asyncio.create_task(_persist_query_sketch())
     yield
-    # (optional teardown logic goes here)
     logger.info("Shutting down — cleaning up.")
+    persist_task.cancel()
+    if query_sketch.dirty:
+        query_sketch.save(settings.query_sketch_path)
+    registry.close()
+    tracer.configure(exporter=None, slow_ms=tracer.slow_ms, sample_rate=tracer.sample_rate)
+
+
+# ---------------------------------------------------------------------------
+# Named datasets — the default one is loaded at startup, the rest lazily
+# ---------------------------------------------------------------------------
+registry = DatasetRegistry(
+    memory_budget_bytes=int(settings.dataset_memory_budget_mb * 1024 * 1024),
+    load_kwargs=dict(
+        compact=settings.model_compact,
+        layout=settings.model_layout,
+        dense_max_cells=settings.dense_max_cells,
+        similar_k=settings.similar_roles_k,
+        similar_block_cells=settings.similar_block_cells,
+        extra_skills=tuple(RESOURCE_DB),
+        variant_scoring=settings.variant_scoring,
+        shards=settings.score_shards,
+        shard_executor=settings.shard_executor,
+    ),
+)
+
+# Interactive-editing sessions (see ml/sessions.py)
+sessions = SessionStore(
+    ttl_seconds=settings.session_ttl_seconds,
+    max_bytes=int(settings.session_memory_mb * 1024 * 1024),
+    max_chars=MAX_SKILLS_LENGTH,
+)
+
+# ---------------------------------------------------------------------------
+# Response cache, query-frequency sketch and warmup (see warmup.py)
+# ---------------------------------------------------------------------------
+response_cache = ResponseCache(max_entries=settings.response_cache_size)
+query_sketch = QuerySketch(
+    width=settings.query_sketch_width,
+    depth=settings.query_sketch_depth,
+    top_k=settings.query_sketch_top_k,
+)
+warmer = CacheWarmer(budget_seconds=settings.warmup_budget_seconds)
+
+
+def _query_key(request: RecommendRequest, dataset: Optional[str]) -> str:
+    """
+    Canonical /recommend request: requests with the same key get the same
+    response except for the `input_skills` echo.
+    """
+    return json.dumps(
+        {
+            "dataset": dataset,
+            "skills": ", ".join(_user_skill_list(request.skills)),
+            "top_n": request.top_n,
+            "fields": sorted(set(request.fields)) if request.fields is not None else None,
+            "collapse_variants": request.collapse_variants,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def _warm_one(ml_model: MLModel, key: str) -> None:
+    """Compute and cache the response for one recorded request key."""
+    payload = json.loads(key)
+    payload.pop("dataset")
+    request = RecommendRequest(**payload)
+    response_cache.put(ml_model, key, _compute_response(request, ml_model))
+
+
+def _start_warmup(dataset: str, ml_model: MLModel) -> None:
+    """Precompute responses for the dataset's hottest recorded requests."""
+    if settings.response_cache_size <= 0:
+        return
+    keys = [key for key, _ in query_sketch.top() if json.loads(key)["dataset"] == dataset]
+    warmer.start(dataset, keys[: settings.response_cache_size], lambda key: _warm_one(ml_model, key))
+
+
+async def _persist_query_sketch() -> None:
+    while True:
+        await asyncio.sleep(settings.query_sketch_save_seconds)
+        if query_sketch.dirty:
+            try:
+                await run_in_threadpool(query_sketch.save, settings.query_sketch_path)
+            except OSError:
+                logger.exception("Could not save query sketch to %s", settings.query_sketch_path)
+
+
+registry.on_load = _start_warmup
 
 
 # ---------------------------------------------------------------------------
@@ -92,18 +246,161 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ── Tracing (no-op until the lifespan configures an exporter) ───────────────
+app.add_middleware(TracingMiddleware)
+
 
 # ---------------------------------------------------------------------------
 # Dependency injection — provides the loaded model to route handlers
 # ---------------------------------------------------------------------------
-def get_model() -> MLModel:
-    """FastAPI dependency that returns the shared, pre-loaded ML model."""
-    if not _global_model.is_ready:
+def get_model(
+    dataset: Optional[str] = Query(
+        default=None,
+        description="Named dataset (catalog) to use; omit for the default",
+    ),
+) -> MLModel:
+    """
+    FastAPI dependency that returns the requested dataset's ML model,
+    loading it on first use.
+    """
+    name = dataset or settings.default_dataset
+    if name == settings.default_dataset and not registry.is_loaded(name):
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="ML model is not ready yet. Please try again in a moment.",
         )
-    return _global_model
+    try:
+        with span("get_model", dataset=name, cold=not registry.is_loaded(name)):
+            return registry.get(name)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown dataset: {name!r}. Available: {', '.join(registry.names)}",
+        ) from None
+    except DatasetUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Dataset {name!r} is unavailable: its catalog could not be loaded.",
+        ) from None
+
+
+def _headline(score_pct: float) -> str:
+    """Motivational headline for a calibrated match score."""
+    if score_pct >= 85:
+        return "Excellent fit — polish your portfolio & start applying!"
+    if score_pct >= 75:
+        return "Solid fit — close a few skill gaps to level up!"
+    if score_pct >= 60:
+        return "Good match — follow the 4-week plan to get job-ready!"
+    if score_pct >= LOW_CONFIDENCE_THRESHOLD:
+        return "Promising path — build the missing skills step by step!"
+    return "Closest available match — your skill set may need a niche role not yet in our dataset."
+
+
+NO_STRONG_MATCH_SUGGESTION = (
+    "None of the roles in our dataset closely match your skills. "
+    "Try adding more recognised skill keywords (e.g. 'python', 'react', 'aws'), "
+    "or your role may not yet be in our dataset — more roles are added regularly."
+)
+
+
+def _rank_roles(request: RecommendRequest, ml_model: MLModel) -> pd.DataFrame:
+    """Top-N roles with raw cosine scores; surfaces failures as HTTP 500."""
+    try:
+        return recommend(
+            request.skills,
+            ml_model,
+            top_n=request.top_n,
+            collapse_variants=request.collapse_variants,
+        )
+    except Exception as exc:
+        logger.exception("Error during recommendation: %s", exc)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while computing recommendations.",
+        ) from exc
+
+
+def _trace_request(request: RecommendRequest) -> None:
+    """Redacted request shape for the trace — sizes only, never the skills text."""
+    set_trace_attributes(
+        skills_chars=len(request.skills),
+        top_n=request.top_n,
+        fields=len(request.fields) if request.fields is not None else None,
+        collapse_variants=request.collapse_variants,
+    )
+
+
+def _wanted_fields(request: RecommendRequest) -> frozenset:
+    """Sparse fieldset — None means the full, backward-compatible response."""
+    return frozenset(request.fields) if request.fields is not None else DEFAULT_ROLE_FIELDS
+
+
+def _user_skill_list(skills: str) -> list[str]:
+    """Normalise the user's skills once — used for every role's gap analysis."""
+    return [
+        s.strip()
+        for s in skills.lower().replace("/", ",").replace(";", ",").split(",")
+        if s.strip()
+    ]
+
+
+def _calibrated_score(raw_cosine: float) -> float:
+    """
+    Raw TF-IDF cosine similarity is compressed toward 0 on short keyword
+    lists — a perfect match typically peaks at 0.5–0.65, never 1.0.
+    Square-root calibration expands the mid-range to an intuitive scale
+    while preserving relative ranking (monotonic transform).
+    """
+    calibrated = math.sqrt(float(raw_cosine))    # sqrt stretches mid-range up
+    return round(min(calibrated * 100, 98.0), 1)
+
+
+def _build_recommendation(
+    row: pd.Series,
+    score_pct: float,
+    wanted: frozenset,
+    user_skill_list: list[str],
+    ml_model: MLModel,
+) -> RoleRecommendation:
+    """
+    Assemble one RoleRecommendation.  Only the requested fields are
+    computed; the rest stay unset and are dropped from the payload
+    (response_model_exclude_unset).
+    """
+    role_fields: dict = {"role": str(row["role"])}
+    if "match_score" in wanted:
+        role_fields["match_score"] = score_pct
+    if "avg_salary" in wanted:
+        role_fields["avg_salary"] = int(row["avg_salary"])
+
+    if not wanted.isdisjoint(("strengths", "missing_skills", "resources", "action_plan")):
+        role_skill_list = [
+            s.strip()
+            for s in str(row["skills"]).lower().split(",")
+            if s.strip()
+        ]
+        strengths, missing = get_strengths_and_missing(user_skill_list, role_skill_list)
+        if "strengths" in wanted:
+            role_fields["strengths"] = strengths
+        if "missing_skills" in wanted:
+            role_fields["missing_skills"] = missing
+        if "resources" in wanted:
+            role_fields["resources"] = get_resources_for_skills(missing)
+        if "action_plan" in wanted:
+            role_fields["action_plan"] = generate_4_week_plan(missing)
+
+    if "mini_projects" in wanted:
+        role_fields["mini_projects"] = get_mini_projects(str(row["role"]))
+    if "headline" in wanted:
+        role_fields["headline"] = _headline(score_pct)
+    if "low_confidence" in wanted:
+        role_fields["low_confidence"] = score_pct < LOW_CONFIDENCE_THRESHOLD
+    if "similar_roles" in wanted:
+        role_fields["similar_roles"] = [
+            name for name, _ in ml_model.similar_roles(str(row["role"])) or []
+        ]
+    return RoleRecommendation(**role_fields)
 
 
 # ---------------------------------------------------------------------------
@@ -140,17 +437,65 @@ def health_check(ml_model: MLModel = Depends(get_model)) -> HealthResponse:
     """
     Liveness / readiness probe.
     Returns 200 when the ML model is loaded and the service is accepting requests.
+    `warmup` reports the background precomputation of hot queries.
     """
+    progress = warmer.progress(registry.name_of(ml_model) or "")
     return HealthResponse(
         status="ok",
         model_ready=ml_model.is_ready,
         dataset_rows=len(ml_model.df) if ml_model.df is not None else None,
+        warmup=WarmupStatus(**progress.as_dict()) if progress is not None else None,
+    )
+
+
+@app.get("/datasets", response_model=DatasetsResponse, tags=["Monitoring"])
+def list_datasets() -> DatasetsResponse:
+    """
+    Registered datasets with load state, memory footprint and cold-load vs
+    warm-hit counts and latencies.  Select one on any endpoint with `?dataset=`.
+    """
+    return DatasetsResponse(
+        default=settings.default_dataset,
+        memory_budget_bytes=registry.memory_budget_bytes,
+        memory_used_bytes=registry.footprint_bytes(),
+        datasets=[DatasetInfo(**row) for row in registry.stats()],
+    )
+
+
+def _compute_response(request: RecommendRequest, ml_model: MLModel) -> RecommendResponse:
+    """Rank roles and build the full /recommend response (uncached)."""
+    top_df = _rank_roles(request, ml_model)
+    wanted = _wanted_fields(request)
+    user_skill_list = _user_skill_list(request.skills)
+
+    recommendations: list[RoleRecommendation] = []
+    low_flags: list[bool] = []
+
+    with span("build_recommendations", roles=len(top_df), fields=len(wanted)):
+        for rank, (_, row) in enumerate(top_df.iterrows()):
+            with span("build_recommendation", rank=rank):
+                score_pct = _calibrated_score(row["score"])
+                recommendations.append(
+                    _build_recommendation(row, score_pct, wanted, user_skill_list, ml_model)
+                )
+                low_flags.append(score_pct < LOW_CONFIDENCE_THRESHOLD)
+
+    # Determine whether ALL results are low-confidence
+    all_low = all(low_flags)
+
+    return RecommendResponse(
+        recommendations=recommendations,
+        total_results=len(recommendations),
+        input_skills=request.skills,
+        no_strong_match=all_low,
+        suggestion=NO_STRONG_MATCH_SUGGESTION if all_low else None,
     )
 
 
 @app.post(
     "/recommend",
     response_model=RecommendResponse,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
     tags=["Recommendations"],
     summary="Get career path recommendations based on skills",
@@ -158,7 +503,7 @@ def health_check(ml_model: MLModel = Depends(get_model)) -> HealthResponse:
 def recommend_careers(
     request: RecommendRequest,
     ml_model: MLModel = Depends(get_model),
-) -> RecommendResponse:
+) -> Response:
     """
     Given a comma-separated list of skills, returns the top-N best-matching
     job roles together with:
@@ -170,91 +515,458 @@ def recommend_careers(
     - Curated learning resources
     - 4-week personalised action plan
     - Mini-project ideas
+
+    Pass `fields` to compute and return only a subset of the per-role data,
+    and `collapse_variants` to keep only the best Junior / Senior / … variant
+    of each role.
+
+    Responses are cached per loaded model under a canonical form of the
+    request, and the most frequent requests are precomputed after every
+    model (re)load.
     """
-    try:
-        top_df = recommend(request.skills, ml_model, top_n=request.top_n)
-    except Exception as exc:
-        logger.exception("Error during recommendation: %s", exc)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while computing recommendations.",
-        ) from exc
+    _trace_request(request)
+    key = _query_key(request, registry.name_of(ml_model))
+    response = response_cache.get(ml_model, key)
+    set_trace_attributes(cache_hit=response is not None)
+    if response is None:
+        response = _compute_response(request, ml_model)
+        response_cache.put(ml_model, key, response)
+    elif response.input_skills != request.skills:
+        response = response.model_copy(update={"input_skills": request.skills})
+    query_sketch.add(key)
+
+    # Serialise here rather than in FastAPI so the cost shows up as a span;
+    # exclude_unset matches response_model_exclude_unset above.
+    with span("serialize_response"):
+        body = response.model_dump_json(exclude_unset=True)
+    return Response(content=body, media_type="application/json")
 
-    # Normalise user skill list once — used for every role below
-    user_skill_list = [
-        s.strip()
-        for s in request.skills.lower().replace("/", ",").replace(";", ",").split(",")
-        if s.strip()
+
+@app.post(
+    "/recommend/stream",
+    tags=["Recommendations"],
+    summary="Stream career path recommendations progressively",
+    response_description="NDJSON (default) or SSE when `Accept: text/event-stream`",
+)
+def recommend_careers_stream(
+    request: RecommendRequest,
+    http_request: Request,
+    ml_model: MLModel = Depends(get_model),
+) -> StreamingResponse:
+    """
+    Same inputs as `/recommend`, streamed so the first result arrives as soon
+    as the ranking is known instead of after every role's learning content
+    has been built.  Events, in order:
+
+    - `ranking` — every role with `match_score`, `avg_salary` and
+      `low_confidence`, plus `total_results`, `no_strong_match`, `suggestion`
+    - `role` — one per role, in rank order: `index` and the full
+      `recommendation` (honouring `fields`)
+    - `done` — or `error` (with the failing `index` and a `detail`) if a
+      role could not be built; the stream ends after it
+
+    Each event is a JSON object with an `event` key, written as one NDJSON
+    line, or as an SSE `event:` / `data:` frame when the client sends
+    `Accept: text/event-stream`.
+    """
+    _trace_request(request)
+    top_df = _rank_roles(request, ml_model)
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    return StreamingResponse(
+        _stream_events(request, top_df, ml_model, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _stream_events(
+    request: RecommendRequest,
+    top_df: pd.DataFrame,
+    ml_model: MLModel,
+    sse: bool,
+) -> Iterator[str]:
+    """Yield ranking → per-role → done events for /recommend/stream."""
+    def frame(event: str, payload: str) -> str:
+        return f"event: {event}\ndata: {payload}\n\n" if sse else payload + "\n"
+
+    rows = [row for _, row in top_df.iterrows()]
+    scores = [_calibrated_score(row["score"]) for row in rows]
+    all_low = all(score < LOW_CONFIDENCE_THRESHOLD for score in scores)
+
+    ranking = [
+        {
+            "role": str(row["role"]),
+            "match_score": score,
+            "avg_salary": int(row["avg_salary"]),
+            "low_confidence": score < LOW_CONFIDENCE_THRESHOLD,
+        }
+        for row, score in zip(rows, scores)
     ]
+    yield frame("ranking", json.dumps({
+        "event": "ranking",
+        "roles": ranking,
+        "total_results": len(ranking),
+        "input_skills": request.skills,
+        "no_strong_match": all_low,
+        "suggestion": NO_STRONG_MATCH_SUGGESTION if all_low else None,
+    }))
+
+    wanted = _wanted_fields(request)
+    user_skill_list = _user_skill_list(request.skills)
+    for index, (row, score) in enumerate(zip(rows, scores)):
+        # One span per role, closed before the yield: each chunk of a sync
+        # stream is produced in its own copy of the request context.
+        try:
+            with span("build_recommendation", rank=index):
+                rec = _build_recommendation(row, score, wanted, user_skill_list, ml_model)
+        except Exception:
+            logger.exception("Failed to build streamed recommendation %d", index)
+            set_trace_attributes(stream_error=True)
+            yield frame("error", json.dumps({
+                "event": "error",
+                "index": index,
+                "detail": "Failed to build this recommendation; the stream ends here.",
+            }))
+            return
+        yield frame("role", json.dumps({
+            "event": "role",
+            "index": index,
+            "recommendation": rec.model_dump(mode="json", exclude_unset=True),
+        }))
+
+    yield frame("done", json.dumps({"event": "done"}))
 
-    recommendations: list[RoleRecommendation] = []
 
-    for _, row in top_df.iterrows():
-        # ── Score calibration ──────────────────────────────────────────────
-        # Raw TF-IDF cosine similarity is compressed toward 0 on short keyword
-        # lists — a perfect match typically peaks at 0.5–0.65, never 1.0.
-        # Square-root calibration expands the mid-range to an intuitive scale
-        # while preserving relative ranking (monotonic transform).
-        raw_cosine = float(row["score"])          # 0.0 – 1.0
-        calibrated = math.sqrt(raw_cosine)        # sqrt stretches mid-range up
-        score_pct = round(min(calibrated * 100, 98.0), 1)
+@app.post(
+    "/recommend/what-if",
+    response_model=WhatIfResponse,
+    tags=["Recommendations"],
+    summary="Rank a role's missing skills by how much each would raise the match score",
+)
+def what_if(
+    request: WhatIfRequest,
+    ml_model: MLModel = Depends(get_model),
+) -> WhatIfResponse:
+    """
+    For the target `role`, add each missing skill to the user's skills in
+    turn and report the resulting match score and its uplift over today's
+    score, largest first.  Scores use the same calibration as `/recommend`;
+    every candidate is scored in one batched operation.
+    """
+    row = ml_model.role_index.get(request.role.strip().lower())
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown role: {request.role!r}",
+        )
+    role_row = ml_model.df.iloc[row]
+    role_skill_list = [s.strip() for s in str(role_row["skills"]).lower().split(",") if s.strip()]
+    _, missing = get_strengths_and_missing(_user_skill_list(request.skills), role_skill_list)
+    set_trace_attributes(skills_chars=len(request.skills), candidates=len(missing))
+
+    raw = skill_uplift_scores(request.skills, ml_model, row, missing)
+    current = _calibrated_score(raw[0])
+    candidates = [
+        SkillUplift(skill=skill, match_score=score, uplift=round(score - current, 1))
+        for skill, score in zip(missing, (_calibrated_score(r) for r in raw[1:]))
+    ]
+    # Stable sort: equal uplifts keep the role's own skill order.
+    candidates.sort(key=lambda c: -c.uplift)
+    return WhatIfResponse(
+        role=str(role_row["role"]),
+        current_score=current,
+        candidates=candidates[: request.limit],
+    )
 
-        role_skill_list = [
-            s.strip()
-            for s in str(row["skills"]).lower().split(",")
-            if s.strip()
-        ]
 
-        strengths, missing = get_strengths_and_missing(user_skill_list, role_skill_list)
-        resources = get_resources_for_skills(missing)
-        action_plan = generate_4_week_plan(missing)
-        mini_projects = get_mini_projects(str(row["role"]))
-
-        # Motivational headline
-        if score_pct >= 85:
-            headline = "Excellent fit — polish your portfolio & start applying!"
-        elif score_pct >= 75:
-            headline = "Solid fit — close a few skill gaps to level up!"
-        elif score_pct >= 60:
-            headline = "Good match — follow the 4-week plan to get job-ready!"
-        elif score_pct >= LOW_CONFIDENCE_THRESHOLD:
-            headline = "Promising path — build the missing skills step by step!"
-        else:
-            headline = "Closest available match — your skill set may need a niche role not yet in our dataset."
-
-        is_low_confidence = score_pct < LOW_CONFIDENCE_THRESHOLD
-
-        recommendations.append(
-            RoleRecommendation(
-                role=str(row["role"]),
-                match_score=score_pct,
-                avg_salary=int(row["avg_salary"]),
-                strengths=strengths,
-                missing_skills=missing,
-                resources=resources,
-                action_plan=action_plan,
-                mini_projects=mini_projects,
-                headline=headline,
-                low_confidence=is_low_confidence,
-            )
+@app.get(
+    # `path` so role names containing "/" (e.g. "UI/UX Designer") still match.
+    "/roles/{role:path}/similar",
+    response_model=SimilarRolesResponse,
+    tags=["Recommendations"],
+    summary="Roles with the most similar skill profile",
+)
+def similar_roles(
+    role: str,
+    k: int = Query(default=5, ge=1, le=20, description="Number of similar roles to return"),
+    ml_model: MLModel = Depends(get_model),
+) -> SimilarRolesResponse:
+    """
+    Look up the precomputed nearest roles for `role` (case-insensitive).
+    At most `SIMILAR_ROLES_K` neighbours are kept per role at startup.
+    """
+    similar = ml_model.similar_roles(role, k=k)
+    if similar is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown role: {role!r}",
         )
+    row = ml_model.role_index[role.strip().lower()]
+    return SimilarRolesResponse(
+        role=str(ml_model.df["role"].iat[row]),
+        similar=[SimilarRole(role=name, similarity=round(score, 4)) for name, score in similar],
+    )
 
-    # Determine whether ALL results are low-confidence
-    all_low = all(r.low_confidence for r in recommendations)
-    suggestion = (
-        "None of the roles in our dataset closely match your skills. "
-        "Try adding more recognised skill keywords (e.g. 'python', 'react', 'aws'), "
-        "or your role may not yet be in our dataset — more roles are added regularly."
-        if all_low else None
+
+@app.get(
+    "/skills/suggest",
+    response_model=SkillSuggestResponse,
+    tags=["Skills"],
+    summary="Autocomplete known skill names",
+)
+def suggest_skills(
+    prefix: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    limit: int = Query(default=8, ge=1, le=10, description="Maximum number of suggestions"),
+    ml_model: MLModel = Depends(get_model),
+) -> SkillSuggestResponse:
+    """
+    Suggest vocabulary skills for a typed prefix, most common across roles first.
+    Matches the start of the skill or of any word in it. Cheap enough to call
+    on every keystroke — the answer is a precomputed table lookup.
+    """
+    return SkillSuggestResponse(
+        prefix=prefix,
+        suggestions=list(ml_model.skill_suggester.suggest(prefix, limit)),
     )
 
-    return RecommendResponse(
-        recommendations=recommendations,
-        total_results=len(recommendations),
-        input_skills=request.skills,
-        no_strong_match=all_low,
-        suggestion=suggestion,
+
+@app.post(
+    "/recommend/resume",
+    response_model=RecommendResponse,
+    response_model_exclude_unset=True,
+    status_code=status.HTTP_200_OK,
+    tags=["Recommendations"],
+    summary="Get career path recommendations from an uploaded resume",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {
+                            "file": {
+                                "type": "string",
+                                "format": "binary",
+                                "description": "Plain-text or Markdown resume",
+                            },
+                            **ResumeOptions.model_json_schema()["properties"],
+                        },
+                    }
+                }
+            },
+        }
+    },
+)
+async def recommend_from_resume(
+    request: Request,
+    ml_model: MLModel = Depends(get_model),
+) -> Response:
+    """
+    Parse the multipart body as it arrives, feeding the `file` part through
+    a single-pass skill scan (word-level Aho-Corasick over the model
+    vocabulary and role skill lists), then run the regular `/recommend`
+    pipeline on the extracted skills.  Uploads over `RESUME_MAX_BYTES` are
+    rejected from Content-Length up front, or as soon as the limit is
+    crossed — nothing is spooled to disk.  `input_skills` in the response
+    echoes the extracted skills.
+    """
+    try:
+        boundary = multipart_boundary(request.headers.get("content-type", ""))
+    except UnsupportedUpload as exc:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)) from None
+
+    max_body = settings.resume_max_bytes + FORM_OVERHEAD_BYTES
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_body:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Resume exceeds {settings.resume_max_bytes} bytes.",
+        )
+
+    upload = ResumeUpload(
+        boundary,
+        ml_model.skill_automaton.scanner(),
+        max_file_bytes=settings.resume_max_bytes,
+        chunk_bytes=settings.resume_chunk_bytes,
+    )
+    received = 0
+    with span("extract_skills"):
+        try:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > max_body:
+                    raise UploadTooLarge(f"Resume exceeds {settings.resume_max_bytes} bytes.")
+                upload.write(chunk)
+            upload.finish()
+        except UploadTooLarge as exc:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+            ) from None
+        except UnsupportedUpload as exc:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(exc)
+            ) from None
+        except MalformedUpload as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from None
+        skills = upload.scanner.skills(max_chars=MAX_SKILLS_LENGTH)
+    set_trace_attributes(resume_bytes=upload.file_bytes, extracted_skills=len(skills))
+
+    if not upload.has_file:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Missing `file` part with the resume.",
+        )
+    try:
+        options = ResumeOptions(**upload.fields)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)]
+        ) from None
+
+    skills_text = ", ".join(skills)
+    if len(skills_text) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No recognisable skills found in the resume. Try typing them manually.",
+        )
+
+    recommend_request = RecommendRequest(
+        skills=skills_text,
+        top_n=options.top_n,
+        collapse_variants=options.collapse_variants,
     )
+    return await run_in_threadpool(recommend_careers, recommend_request, ml_model)
+
+
+# ---------------------------------------------------------------------------
+# Scoring sessions — incremental rescoring while the user edits skills
+# ---------------------------------------------------------------------------
+def _get_session(session_id: str) -> ScoringSession:
+    """Live session, re-scored against its dataset's current model if that was reloaded."""
+    try:
+        session = sessions.get(session_id)
+        ml_model = registry.get(session.dataset)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown or expired session: {session_id!r}",
+        ) from None
+    except DatasetUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Dataset {session.dataset!r} is unavailable: its catalog could not be loaded.",
+        ) from None
+    if session.model is not ml_model:
+        with session.lock:
+            if session.model is not ml_model:
+                session.rebind(ml_model)
+        sessions.enforce_cap(session)
+    return session
+
+
+def _session_response(session: ScoringSession, top_n: int) -> SessionResponse:
+    idx, raw_scores = session.top_k(top_n)
+    df = session.model.df
+    ranked = []
+    for row, raw in zip(idx, raw_scores):
+        score_pct = _calibrated_score(raw)
+        ranked.append(RankedRole(
+            role=str(df["role"].iat[row]),
+            match_score=score_pct,
+            avg_salary=int(df["avg_salary"].iat[row]),
+            low_confidence=score_pct < LOW_CONFIDENCE_THRESHOLD,
+        ))
+    return SessionResponse(
+        session_id=session.session_id,
+        dataset=session.dataset,
+        skills=list(session.skills),
+        recommendations=ranked,
+        no_strong_match=all(r.low_confidence for r in ranked),
+        expires_in_seconds=round(sessions.expires_in(session), 1),
+    )
+
+
+@app.post(
+    "/sessions",
+    response_model=SessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["Sessions"],
+    summary="Start an interactive skill-editing session",
+)
+def create_session(
+    request: SessionCreateRequest,
+    dataset: Optional[str] = Query(default=None, description="Named dataset; omit for the default"),
+    ml_model: MLModel = Depends(get_model),
+) -> SessionResponse:
+    """
+    Create a session holding the skill list and its per-role scores
+    server-side.  Edit it with `PATCH /sessions/{id}` — each edit rescores
+    only the terms that changed instead of the whole catalog.  Sessions
+    expire after `SESSION_TTL_SECONDS` idle.
+    """
+    try:
+        session = sessions.create(dataset or settings.default_dataset, ml_model, request.skills)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from None
+    set_trace_attributes(skills=len(session.skills), top_n=request.top_n)
+    return _session_response(session, request.top_n)
+
+
+@app.patch(
+    "/sessions/{session_id}",
+    response_model=SessionResponse,
+    tags=["Sessions"],
+    summary="Add or remove skills and get the updated top roles",
+)
+def update_session(session_id: str, request: SessionUpdateRequest) -> SessionResponse:
+    """
+    Remove `remove`, then append `add` (case-insensitive, duplicates
+    ignored), and return the new top-N.  The result matches `/recommend`
+    for the comma-joined `skills` list.
+    """
+    session = _get_session(session_id)
+    with session.lock:
+        with span("session_update", added=len(request.add), removed=len(request.remove)):
+            try:
+                session.update(add=request.add, remove=request.remove)
+            except ValueError as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+                ) from None
+        sessions.enforce_cap(session)
+        return _session_response(session, request.top_n)
+
+
+@app.get(
+    "/sessions/{session_id}",
+    response_model=SessionResponse,
+    tags=["Sessions"],
+    summary="Current skills and top roles of a session",
+)
+def get_session(
+    session_id: str,
+    top_n: int = Query(default=3, ge=1, le=10, description="Number of top roles to return"),
+) -> SessionResponse:
+    session = _get_session(session_id)
+    with session.lock:
+        return _session_response(session, top_n)
+
+
+@app.delete(
+    "/sessions/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    tags=["Sessions"],
+    summary="End a session",
+)
+def delete_session(session_id: str) -> Response:
+    if not sessions.delete(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown or expired session: {session_id!r}",
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 # ---------------------------------------------------------------------------
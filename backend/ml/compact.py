@@ -0,0 +1,116 @@
+"""
+ml/compact.py
+-------------
+Memory-lean representations of the fitted TF-IDF artefacts.
+
+The default scikit-learn vectorizer keeps its vocabulary in a Python dict
+(one str + one int object per term, plus the hash table).  For large
+catalogs with bigrams that dominates the model footprint, so compact mode
+swaps it for a sorted, packed structure that answers the same lookups.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Iterator
+
+import numpy as np
+
+
+class CompactVocabulary(Mapping):
+    """
+    Read-only ``term -> column id`` mapping backed by one UTF-8 blob.
+
+    scikit-learn sorts its fitted vocabulary alphabetically, so the column
+    id of a term is simply its rank.  Terms are stored back to back in a
+    single ``bytes`` object with an ``int32`` offsets array, and lookups are
+    a binary search over the packed terms.  Drop-in replacement for
+    ``TfidfVectorizer.vocabulary_`` at transform time.
+    """
+
+    __slots__ = ("_blob", "_offsets")
+
+    def __init__(self, vocabulary: Mapping[str, int]) -> None:
+        terms = sorted(vocabulary, key=vocabulary.__getitem__)
+        if [vocabulary[t] for t in terms] != list(range(len(terms))):
+            raise ValueError("vocabulary ids must be a dense 0..n-1 range")
+        encoded = [t.encode("utf-8") for t in terms]
+        if encoded != sorted(encoded):
+            raise ValueError("vocabulary ids must follow sorted term order")
+
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        self._blob = b"".join(encoded)
+        self._offsets = offsets
+
+    # ------------------------------------------------------------------
+    def _term(self, idx: int) -> bytes:
+        return self._blob[self._offsets[idx]:self._offsets[idx + 1]]
+
+    def _find(self, term: str) -> int:
+        key = term.encode("utf-8")
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self._term(lo) == key:
+            return lo
+        return -1
+
+    # ── Mapping protocol ──────────────────────────────────────────────────
+    def __getitem__(self, term: str) -> int:
+        if not isinstance(term, str):
+            raise KeyError(term)
+        idx = self._find(term)
+        if idx < 0:
+            raise KeyError(term)
+        return idx
+
+    def __contains__(self, term: object) -> bool:
+        return isinstance(term, str) and self._find(term) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self._term(i).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    # ------------------------------------------------------------------
+    @property
+    def nbytes(self) -> int:
+        """Approximate resident size of the packed structure."""
+        return sys.getsizeof(self._blob) + self._offsets.nbytes
+
+
+def vocabulary_nbytes(vocabulary: Mapping[str, int]) -> int:
+    """Approximate resident size of a vocabulary mapping, keys and values included."""
+    if isinstance(vocabulary, CompactVocabulary):
+        return vocabulary.nbytes
+    return sys.getsizeof(vocabulary) + sum(
+        sys.getsizeof(k) + sys.getsizeof(v) for k, v in vocabulary.items()
+    )
+
+
+def matrix_nbytes(X) -> int:
+    """Resident size of a dense ndarray or scipy CSR matrix."""
+    if isinstance(X, np.ndarray):
+        return X.nbytes
+    return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+
+def compact_vectorizer(vectorizer) -> None:
+    """
+    Strip fit-only state from a fitted ``TfidfVectorizer`` in place.
+
+    - ``stop_words_`` (terms cut by max_df/min_df; older scikit-learn only)
+      is documented as safe to delete and is never read by ``transform``.
+    - ``vocabulary_`` is replaced with a :class:`CompactVocabulary`.
+    """
+    if hasattr(vectorizer, "stop_words_"):
+        del vectorizer.stop_words_
+    vectorizer.vocabulary_ = CompactVocabulary(vectorizer.vocabulary_)
@@ -0,0 +1,119 @@
+"""
+ml/encoder.py
+-------------
+Fast TF-IDF encoding of a single short query.
+
+``vectorizer.transform`` runs the generic scikit-learn pipeline
+(preprocessor, tokenizer, stop-word filter, n-grams, CountVectorizer
+matrix build, validation, idf scaling, normalisation) even for a
+ten-word skill list, and that fixed overhead dominates a request.
+``QueryEncoder`` is built once from the fitted vocabulary and idf and does
+the same arithmetic directly:
+
+    tokens  → lower-case [a-z0-9] runs of length ≥ 2, stop words removed
+    terms   → word n-grams over the remaining tokens
+    weights → count × idf, L2-normalised (squares summed in index order
+              in double precision, as sklearn does)
+
+For any text, ``encode(text)`` equals
+``vectorizer.transform([clean_query(text)])`` bit for bit — benchmark.py
+fuzzes this.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Iterable
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+_DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+# After clean_query only [a-z0-9 ] is left, where sklearn's default
+# token pattern matches exactly the [a-z0-9] runs of length ≥ 2.
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+
+def clean_query(user_skills_text: str) -> str:
+    """Same cleaning as the catalog skills, with commas as plain separators."""
+    return re.sub(r"[^a-z0-9, ]", " ", user_skills_text.lower().strip().replace(",", " "))
+
+
+class QueryEncoder:
+    """Fitted-vocabulary shortcut for ``vectorizer.transform`` on one query."""
+
+    def __init__(self, vectorizer: TfidfVectorizer) -> None:
+        if (
+            vectorizer.analyzer != "word"
+            or vectorizer.token_pattern != _DEFAULT_TOKEN_PATTERN
+            or vectorizer.tokenizer is not None
+            or vectorizer.preprocessor is not None
+            or vectorizer.strip_accents is not None
+            or not vectorizer.lowercase
+            or vectorizer.binary
+            or vectorizer.sublinear_tf
+            or not vectorizer.use_idf
+            or vectorizer.norm != "l2"
+        ):
+            raise ValueError("QueryEncoder supports the default word analyzer with l2-normalised tf-idf only")
+        # vocabulary_ is read through the vectorizer on each call: the
+        # dataset registry may swap in a pooled, shared vocabulary after load.
+        self._vectorizer = vectorizer
+        self._idf = vectorizer.idf_
+        self._stop_words = vectorizer.get_stop_words() or frozenset()
+        self._min_n, self._max_n = vectorizer.ngram_range
+        self.dtype = vectorizer.dtype
+        self.n_features = len(self._idf)
+
+    # ------------------------------------------------------------------
+    def term_counts(self, user_skills_text: str) -> dict[int, int]:
+        """Vocabulary id → raw count of the query's n-grams."""
+        stop = self._stop_words
+        tokens = [t for t in _TOKEN_RE.findall(user_skills_text.lower()) if t not in stop]
+        vocab = self._vectorizer.vocabulary_
+        counts: dict[int, int] = {}
+        n_tokens = len(tokens)
+        for n in range(self._min_n, min(self._max_n, n_tokens) + 1):
+            for i in range(n_tokens - n + 1):
+                j = vocab.get(tokens[i] if n == 1 else " ".join(tokens[i:i + n]))
+                if j is not None:
+                    counts[j] = counts.get(j, 0) + 1
+        return counts
+
+    def encode(self, user_skills_text: str) -> tuple[np.ndarray, np.ndarray]:
+        """(sorted vocabulary ids, L2-normalised tf-idf weights) of the query."""
+        counts = self.term_counts(user_skills_text)
+        indices = np.array(sorted(counts), dtype=np.int32)
+        data = np.array([counts[j] for j in indices.tolist()], dtype=self.dtype)
+        data *= self._idf[indices]
+
+        sum_sq = 0.0
+        for sq in (data * data).tolist():      # sequential, in double — as sklearn
+            sum_sq += sq
+        if sum_sq != 0.0:
+            data = (data.astype(np.float64) / math.sqrt(sum_sq)).astype(self.dtype, copy=False)
+        return indices, data
+
+    def transform(self, user_skills_text: str) -> sp.csr_matrix:
+        """1 × n_features CSR row, like ``vectorizer.transform([clean_query(text)])``."""
+        indices, data = self.encode(user_skills_text)
+        return sp.csr_matrix(
+            (data, indices, np.array([0, len(indices)], dtype=np.int32)),
+            shape=(1, self.n_features),
+        )
+
+    def transform_many(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """Several queries as one CSR batch, one row per text."""
+        encoded = [self.encode(t) for t in texts]
+        indptr = np.zeros(len(encoded) + 1, dtype=np.int32)
+        np.cumsum([len(idx) for idx, _ in encoded], out=indptr[1:])
+        return sp.csr_matrix(
+            (
+                np.concatenate([d for _, d in encoded]) if encoded else np.empty(0, self.dtype),
+                np.concatenate([i for i, _ in encoded]) if encoded else np.empty(0, np.int32),
+                indptr,
+            ),
+            shape=(len(encoded), self.n_features),
+        )
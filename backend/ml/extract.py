@@ -0,0 +1,195 @@
+"""
+ml/extract.py
+-------------
+Single-pass skill extraction from free text (resumes) with a word-level
+Aho-Corasick automaton.
+
+Patterns are known skills as token sequences ("machine learning" →
+("machine", "learning")).  Tokens are lower-case alphanumeric runs, like
+the model's skill cleaning, except that trailing "+" / "#" stay part of the
+token and "/" is a token of its own — so "c++", "c#" and "ci/cd" remain
+distinct patterns instead of collapsing to "c" or "ci cd".  Every token
+advances the automaton once, so all patterns are found in one pass
+regardless of how many there are.  Matching on whole tokens gives word
+boundaries for free ("java" never fires inside "javascript").
+Single-letter skills ("c", "r") are only matched inside longer phrases:
+on their own they fire on initials, grades and list markers.
+
+Input can arrive in chunks: ``SkillScanner`` carries the automaton state
+and at most one partial token across chunk boundaries, so memory stays
+bounded by the chunk size whatever the document length.
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+from collections import deque
+from typing import Iterable
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*|/")
+# Characters that can continue a token across a chunk boundary ("/" is a
+# complete token on its own).
+_NON_TOKEN_RE = re.compile(r"[^a-z0-9+#]")
+_LEADING_TOKEN_RE = re.compile(r"[a-z0-9+#]*")
+
+
+def _tokenise(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SkillAutomaton:
+    """Word-level Aho-Corasick automaton over known skill phrases."""
+
+    def __init__(self, skills: Iterable[str]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        terminal: list[int] = [-1]          # pattern id ending at state, or -1
+        names: list[str] = []
+        patterns: list[tuple[str, ...]] = []
+        seen: set[tuple[str, ...]] = set()
+
+        for skill in skills:
+            tokens = tuple(_tokenise(skill))
+            if not tokens or tokens in seen or tokens[0] == "/" or tokens[-1] == "/":
+                continue
+            if len(tokens) == 1 and len(tokens[0]) == 1:
+                continue                    # lone single letter: too ambiguous
+            seen.add(tokens)
+            state = 0
+            for tok in tokens:
+                nxt = goto[state].get(tok)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][tok] = nxt
+                    goto.append({})
+                    terminal.append(-1)
+                state = nxt
+            terminal[state] = len(names)
+            names.append(skill.strip().lower())
+            patterns.append(tokens)
+
+        # Breadth-first failure links; each state's outputs include those of
+        # its failure chain so a step never has to walk it at match time.
+        fail = [0] * len(goto)
+        outputs: list[tuple[int, ...]] = [()] * len(goto)
+        queue: deque[int] = deque()
+        for child in goto[0].values():
+            outputs[child] = (terminal[child],) if terminal[child] >= 0 else ()
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            for tok, child in goto[state].items():
+                f = fail[state]
+                while f and tok not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(tok, 0)
+                own = (terminal[child],) if terminal[child] >= 0 else ()
+                outputs[child] = own + outputs[fail[child]]
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self.names: list[str] = names
+        self.patterns: list[tuple[str, ...]] = patterns
+        self.max_token_len: int = max((len(t) for p in seen for t in p), default=0)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ------------------------------------------------------------------
+    def scanner(self) -> "SkillScanner":
+        return SkillScanner(self)
+
+    def extract(self, text: str) -> list[str]:
+        """Convenience one-shot extraction for an in-memory string."""
+        scan = self.scanner()
+        scan.feed(text)
+        return scan.skills()
+
+
+class SkillScanner:
+    """Incremental scan state for one document."""
+
+    def __init__(self, automaton: SkillAutomaton) -> None:
+        self._ac = automaton
+        self._state = 0
+        self._carry = ""                      # trailing partial token
+        self._skip_partial = False            # inside an over-long token being discarded
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self.counts: dict[int, int] = {}      # pattern id → hits (insertion = first seen)
+        self.bytes_scanned = 0
+
+    def feed(self, chunk: bytes | str) -> None:
+        """Scan the next piece of the document."""
+        if isinstance(chunk, bytes):
+            self.bytes_scanned += len(chunk)
+            chunk = self._decoder.decode(chunk)
+        text = chunk.lower()
+        if self._skip_partial:
+            start = _LEADING_TOKEN_RE.match(text).end()
+            if start == len(text):
+                return
+            text = text[start:]
+            self._skip_partial = False
+        text = self._carry + text
+
+        # Hold back a token that may continue in the next chunk.  A partial
+        # token longer than any known one can never match — drop it (and its
+        # continuation) instead of buffering it.
+        cut = len(text)
+        while cut and not _NON_TOKEN_RE.match(text[cut - 1]):
+            cut -= 1
+        overlong = len(text) - cut > self._ac.max_token_len
+        self._carry = "" if overlong else text[cut:]
+        self._step(_TOKEN_RE.findall(text, 0, cut))
+        if overlong:
+            self._skip_partial = True
+            self._state = 0                   # the dropped token breaks any phrase
+
+    def finish(self) -> None:
+        """Flush the trailing token; call once after the last chunk."""
+        tail = self._decoder.decode(b"", final=True)
+        if self._skip_partial:
+            tail = tail.lower()[_LEADING_TOKEN_RE.match(tail.lower()).end():]
+        tail = self._carry + tail
+        self._carry = ""
+        self._skip_partial = False
+        self._step(_TOKEN_RE.findall(tail.lower()))
+
+    def _step(self, tokens: list[str]) -> None:
+        goto, fail, outputs, counts = self._ac._goto, self._ac._fail, self._ac._outputs, self.counts
+        state = self._state
+        for tok in tokens:
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            for pid in outputs[state]:
+                counts[pid] = counts.get(pid, 0) + 1
+        self._state = state
+
+    # ------------------------------------------------------------------
+    def skills(self, max_chars: int | None = None) -> list[str]:
+        """
+        Matched skills, most frequent first (ties: first occurrence).
+        Single-token skills already covered by a matched phrase ("learning"
+        inside "machine learning", "ci" inside "ci/cd") are dropped.
+        `max_chars` caps the total length of the comma-joined list.
+        """
+        self.finish()
+        names, patterns = self._ac.names, self._ac.patterns
+        phrase_tokens = {t for pid in self.counts if len(patterns[pid]) > 1 for t in patterns[pid]}
+        ranked = sorted(
+            (pid for pid in self.counts
+             if len(patterns[pid]) > 1 or patterns[pid][0] not in phrase_tokens),
+            key=lambda pid: -self.counts[pid],
+        )
+        out: list[str] = []
+        used = 0
+        for pid in ranked:
+            name = names[pid]
+            if max_chars is not None and used + len(name) + 2 > max_chars:
+                break
+            out.append(name)
+            used += len(name) + 2
+        return out
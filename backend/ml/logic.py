@@ -10,9 +10,12 @@ from __future__ import annotations
 
 from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 from backend.ml.model import MLModel
+from backend.ml.variants import strip_seniority
+from backend.tracing import span
 
 # ---------------------------------------------------------------------------
 # Knowledge bases (constants)
@@ -254,16 +257,48 @@ def recommend(
     user_skills_text: str,
     model: MLModel,
     top_n: int = 3,
+    collapse_variants: bool = False,
 ) -> pd.DataFrame:
     """
     Compute cosine-similarity scores and return the top-N matching roles
     as a DataFrame with an extra 'score' column.
+    With collapse_variants, only the best-scoring member of each seniority
+    family (e.g. Junior / Senior Data Scientist) is kept.
     """
-    scores = model.similarity_scores(user_skills_text)
-    df_result = model.df.copy()
-    df_result["score"] = scores
-    df_result = df_result.sort_values("score", ascending=False).reset_index(drop=True)
-    return df_result.head(top_n).copy()
+    with span("recommend", top_n=top_n, collapse_variants=collapse_variants):
+        k = top_n
+        if collapse_variants:
+            # Enough candidates to still hold top_n distinct families
+            k *= int(np.bincount(model.family_of).max())
+        idx, scores = model.top_k(user_skills_text, k)
+        if collapse_variants:
+            best_per_family = ~pd.Series(model.family_of[idx]).duplicated().to_numpy()
+            idx, scores = idx[best_per_family][:top_n], scores[best_per_family][:top_n]
+        df_result = model.df.iloc[idx].reset_index(drop=True)
+        df_result["score"] = scores
+        return df_result
+
+
+def skill_uplift_scores(
+    user_skills_text: str,
+    model: MLModel,
+    row: int,
+    candidate_skills: List[str],
+) -> np.ndarray:
+    """
+    Raw cosine scores of role `row` for the user's skills as they are
+    (element 0) and with each candidate skill appended (elements 1…).
+    All augmented queries are vectorised as one sparse batch and scored
+    against the role's row of X in a single product.
+    """
+    with span("skill_uplift", candidates=len(candidate_skills)):
+        queries = model.query_matrix(
+            [user_skills_text] + [f"{user_skills_text}, {skill}" for skill in candidate_skills]
+        )
+        role_vec = model.X[row]
+        if isinstance(role_vec, np.ndarray):
+            return queries @ role_vec
+        return np.asarray((queries @ role_vec.T).todense()).ravel()
 
 
 def get_strengths_and_missing(
@@ -356,11 +391,9 @@ def get_mini_projects(role_name: str) -> list[str]:
     3. Partial key containment (role contains key or key contains role)
     4. Default fallback
     """
-    import re as _re
-
     candidates = [role_name]
     # Strip seniority prefix: "Senior Data Scientist" → "Data Scientist"
-    stripped = _re.sub(r'^(junior|senior|lead|staff|principal)\s+', '', role_name, flags=_re.IGNORECASE).strip()
+    stripped = strip_seniority(role_name)
     if stripped != role_name:
         candidates.append(stripped)
     # Also try splitting on " - " and ","
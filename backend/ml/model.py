@@ -10,12 +10,20 @@ from __future__ import annotations
 
 import logging
 import os
-import re
-from typing import Optional
+import threading
+from typing import Iterable, Optional
 
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+from backend.ml.compact import compact_vectorizer, matrix_nbytes, vocabulary_nbytes
+from backend.ml.encoder import QueryEncoder
+from backend.ml.extract import SkillAutomaton
+from backend.ml.shards import ShardedScorer, score_matrix, top_k_indices
+from backend.ml.suggest import SkillSuggester
+from backend.ml.variants import VariantIndex
+from backend.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -72,11 +80,13 @@ def _build_default_dataset() -> pd.DataFrame:
     return pd.DataFrame(rows, columns=["role", "skills", "avg_salary"])
 
 
-def _load_dataframe(csv_path: str) -> pd.DataFrame:
-    """Load CSV; generate and save it if missing."""
+def _load_dataframe(csv_path: str, generate_missing: bool = True) -> pd.DataFrame:
+    """Load CSV; generate and save the built-in catalog if missing (when allowed)."""
     if os.path.exists(csv_path):
         df = pd.read_csv(csv_path)
         logger.info("Loaded dataset from %s (%d rows)", csv_path, len(df))
+    elif not generate_missing:
+        raise FileNotFoundError(f"Catalog CSV not found: {csv_path}")
     else:
         logger.warning("CSV not found at %s — generating default dataset.", csv_path)
         df = _build_default_dataset()
@@ -86,6 +96,46 @@ def _load_dataframe(csv_path: str) -> pd.DataFrame:
     return df
 
 
+def _choose_layout(layout: str, X, dense_max_cells: int) -> str:
+    """Resolve "auto" to "dense" for small catalogs, "sparse" otherwise."""
+    if layout not in ("auto", "sparse", "dense"):
+        raise ValueError(f"Unknown matrix layout: {layout!r}")
+    if layout != "auto":
+        return layout
+    n_rows, n_cols = X.shape
+    return "dense" if n_rows * n_cols <= dense_max_cells else "sparse"
+
+
+def _top_k_neighbours(X, k: int, block_cells: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k most similar other rows for every row of an L2-normalised X.
+
+    Computes X @ X.T one row block at a time so the dense score block never
+    exceeds ~block_cells entries, whatever the catalog size.
+    Returns (indices, scores), both shaped (n_rows, k), best first.
+    """
+    n_rows = X.shape[0]
+    k = min(k, n_rows - 1)
+    indices = np.empty((n_rows, max(k, 0)), dtype=np.int32)
+    scores = np.empty((n_rows, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return indices, scores
+
+    block = max(1, block_cells // n_rows)
+    XT = X.T
+    for start in range(0, n_rows, block):
+        stop = min(start + block, n_rows)
+        sims = X[start:stop] @ XT
+        sims = sims if isinstance(sims, np.ndarray) else sims.toarray()
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf   # exclude self
+        part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(sims, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(part, order, axis=1)
+        scores[start:stop] = np.take_along_axis(part_scores, order, axis=1)
+    return indices, scores
+
+
 # ---------------------------------------------------------------------------
 # Public model state (populated once via load_model())
 # ---------------------------------------------------------------------------
@@ -95,13 +145,61 @@ class MLModel:
     def __init__(self) -> None:
         self.df: Optional[pd.DataFrame] = None
         self.vectorizer: Optional[TfidfVectorizer] = None
-        self.X = None          # sparse TF-IDF matrix
+        self.X = None          # TF-IDF matrix — scipy CSR, or ndarray when dense
+        self.layout: str = "sparse"
+        self.compact: bool = False
+        self.role_index: dict[str, int] = {}          # lower-cased role → row
+        self.similar_idx: Optional[np.ndarray] = None  # (rows, k) neighbour rows
+        self.similar_scores: Optional[np.ndarray] = None
+        self.skill_suggester: Optional[SkillSuggester] = None
+        self.skill_automaton: Optional[SkillAutomaton] = None
+        self.family_of: Optional[np.ndarray] = None    # row → seniority-family id
+        self.variants: Optional[VariantIndex] = None   # None → score X directly
+        self.sharded: Optional[ShardedScorer] = None   # row shards scored in parallel
         self.is_ready: bool = False
+        self.encoder: Optional[QueryEncoder] = None    # fast path for vectorizer.transform
+        self._postings = None  # CSC copy of sparse X, built on first use
+        self._postings_lock = threading.Lock()
 
     # ------------------------------------------------------------------
-    def load(self, csv_path: str) -> None:
-        """Load data and fit/precompute everything. Call once at startup."""
-        df = _load_dataframe(csv_path)
+    def load(
+        self,
+        csv_path: str,
+        compact: bool = False,
+        layout: str = "sparse",
+        dense_max_cells: int = 0,
+        similar_k: int = 5,
+        similar_block_cells: int = 4_000_000,
+        extra_skills: Iterable[str] = (),
+        variant_scoring: bool = False,
+        shards: int = 0,
+        shard_executor: str = "thread",
+        generate_missing: bool = True,
+    ) -> None:
+        """
+        Load data and fit/precompute everything. Call once at startup.
+
+        compact          store X / IDF as float32 and strip fit-only vectorizer
+                         state (see ml/compact.py).
+        layout           "sparse", "dense", or "auto" — auto picks a dense
+                         ndarray (BLAS matvec) when rows × vocab ≤ dense_max_cells.
+        similar_k        neighbours precomputed per role for similar_roles().
+        similar_block_cells
+                         memory bound (dense cells) for the blockwise X @ X.T.
+        extra_skills     additional known skill names for autocomplete
+                         (e.g. RESOURCE_DB keys) beyond the roles' own skills.
+        variant_scoring  score Junior / Senior / … families through one shared
+                         vector each (see ml/variants.py). Only used when the
+                         layout resolves to "sparse" (a dense matvec is
+                         already cheaper) and the dataset actually contains
+                         multi-member families.
+        shards           > 1 splits X into row shards scored in parallel on a
+                         "thread" or "process" pool (see ml/shards.py).
+                         Takes precedence over layout and variant_scoring.
+        generate_missing write and use the built-in catalog when csv_path does
+                         not exist; otherwise raise FileNotFoundError.
+        """
+        df = _load_dataframe(csv_path, generate_missing)
         df["skills_clean"] = (
             df["skills"]
             .astype(str)
@@ -109,25 +207,180 @@ class MLModel:
             .str.replace(r"[^a-z0-9, ]", " ", regex=True)
         )
 
-        vectorizer = TfidfVectorizer(ngram_range=(1, 2), stop_words="english")
+        vectorizer = TfidfVectorizer(
+            ngram_range=(1, 2),
+            stop_words="english",
+            dtype=np.float32 if compact else np.float64,
+        )
         X = vectorizer.fit_transform(df["skills_clean"])
+        if compact:
+            compact_vectorizer(vectorizer)
+
+        resolved = _choose_layout(layout, X, dense_max_cells)
+        if resolved == "dense":
+            X = np.ascontiguousarray(X.toarray())
+
+        similar_idx, similar_scores = _top_k_neighbours(X, similar_k, similar_block_cells)
+        role_index: dict[str, int] = {}
+        for i, role in enumerate(df["role"].astype(str)):
+            role_index.setdefault(role.lower(), i)
+        skill_suggester = SkillSuggester(
+            (str(skills).split(",") for skills in df["skills"]),
+            extra_skills=extra_skills,
+        )
+        # Resume extraction: every role skill phrase, plus single-word
+        # vocabulary terms (bigrams are mostly cross-skill artefacts).
+        skill_automaton = SkillAutomaton(
+            [s for skills in df["skills"] for s in str(skills).split(",")]
+            + [t for t in vectorizer.vocabulary_ if " " not in t]
+        )
+        variants = VariantIndex(df["role"], vectorizer, df["skills_clean"])
+        if (
+            not variant_scoring
+            or resolved != "sparse"
+            or variants.n_families == len(df)
+            or shards > 1
+        ):
+            variants_for_scoring = None
+        else:
+            variants_for_scoring = variants
+        sharded = ShardedScorer(X, shards, shard_executor) if shards > 1 else None
 
         self.df = df
         self.vectorizer = vectorizer
         self.X = X
+        self.layout = resolved
+        self.compact = compact
+        self.role_index = role_index
+        self.similar_idx = similar_idx
+        self.similar_scores = similar_scores
+        self.skill_suggester = skill_suggester
+        self.skill_automaton = skill_automaton
+        self.family_of = variants.family_of
+        self.variants = variants_for_scoring
+        if self.sharded is not None:
+            self.sharded.close()
+        self.sharded = sharded
+        self.encoder = QueryEncoder(vectorizer)
+        self._postings = None
         self.is_ready = True
-        logger.info("TF-IDF model ready — vocab size: %d, dataset rows: %d",
-                    len(vectorizer.vocabulary_), len(df))
+        logger.info("TF-IDF model ready — vocab size: %d, dataset rows: %d, "
+                    "role families: %d, layout: %s%s%s%s",
+                    len(vectorizer.vocabulary_), len(df), variants.n_families, resolved,
+                    " (compact)" if compact else "",
+                    " (variant scoring)" if variants_for_scoring is not None else "",
+                    f" ({len(sharded)} {shard_executor} shards)" if sharded is not None else "")
 
     # ------------------------------------------------------------------
+    def _query_vector(self, user_skills_text: str):
+        return self.encoder.transform(user_skills_text)
+
+    def query_matrix(self, texts: Iterable[str]):
+        """L2-normalised TF-IDF vectors of several queries as one sparse batch."""
+        if not self.is_ready:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        return self.encoder.transform_many(texts)
+
+    def _scoring_path(self) -> str:
+        if self.sharded is not None:
+            return "sharded"
+        return "variants" if self.variants is not None else self.layout
+
     def similarity_scores(self, user_skills_text: str):
         """Return a flat array of cosine-similarity scores for every role."""
         if not self.is_ready:
             raise RuntimeError("Model not loaded. Call load() first.")
-        cleaned = re.sub(r"[^a-z0-9, ]", " ", user_skills_text.lower().strip().replace(",", " "))
-        user_vec = self.vectorizer.transform([cleaned])
-        return cosine_similarity(user_vec, self.X).flatten()
+        with span("similarity_scores", rows=len(self.df), path=self._scoring_path()):
+            user_vec = self._query_vector(user_skills_text)
+            if self.sharded is not None:
+                return self.sharded.scores(user_vec)
+            if self.variants is not None:
+                return self.variants.scores(user_vec)
+            return score_matrix(user_vec, self.X)
+
+    def top_k(self, user_skills_text: str, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Row indices and cosine scores of the k best-matching roles, best
+        first; equal scores keep dataset order.  Sharded models merge
+        per-shard top-k lists instead of materialising every score.
+        """
+        if not self.is_ready:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        if self.sharded is None:
+            scores = self.similarity_scores(user_skills_text)
+            idx = top_k_indices(scores, k)
+            return idx, scores[idx]
+        with span("similarity_scores", rows=len(self.df), path="sharded", k=k):
+            return self.sharded.top_k(self._query_vector(user_skills_text), k)
+
+    # ------------------------------------------------------------------
+    def query_term_counts(self, user_skills_text: str) -> dict[int, int]:
+        """
+        Vocabulary id → raw count of the query's terms (unigrams and bigrams),
+        i.e. the query vector before IDF weighting and L2 normalisation.
+        """
+        if not self.is_ready:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        return self.encoder.term_counts(user_skills_text)
+
+    def add_term_columns(self, out: np.ndarray, term_ids: np.ndarray, weights: np.ndarray) -> None:
+        """
+        out += X[:, term_ids] @ weights, reading only those terms' postings
+        (column entries) rather than every row of X.
+        """
+        if isinstance(self.X, np.ndarray):
+            out += self.X[:, term_ids] @ weights
+            return
+        if self._postings is None:
+            with self._postings_lock:
+                if self._postings is None:
+                    self._postings = self.X.tocsc()
+        cols = self._postings
+        for j, w in zip(term_ids, weights):
+            lo, hi = cols.indptr[j], cols.indptr[j + 1]
+            out[cols.indices[lo:hi]] += w * cols.data[lo:hi]
+
+    def close(self) -> None:
+        """Release worker pools (sharded scoring); shards are then scored inline."""
+        if self.sharded is not None:
+            self.sharded.close()
+
+    # ------------------------------------------------------------------
+    def similar_roles(self, role: str, k: Optional[int] = None) -> Optional[list[tuple[str, float]]]:
+        """
+        Precomputed nearest roles for `role` as (role, cosine) pairs, best first.
+        Returns None when the role is not in the dataset.
+        """
+        if not self.is_ready:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        row = self.role_index.get(role.strip().lower())
+        if row is None:
+            return None
+        roles = self.df["role"]
+        neighbours = self.similar_idx[row][:k]
+        return [
+            (str(roles.iat[j]), float(score))
+            for j, score in zip(neighbours, self.similar_scores[row][:k])
+        ]
+
+    # ------------------------------------------------------------------
+    def memory_report(self) -> dict[str, int]:
+        """Approximate resident bytes of the scoring artefacts."""
+        if not self.is_ready:
+            raise RuntimeError("Model not loaded. Call load() first.")
+        report = {
+            "matrix": matrix_nbytes(self.X),
+            "idf": self.vectorizer.idf_.nbytes,
+            "vocabulary": vocabulary_nbytes(self.vectorizer.vocabulary_),
+            "similar_index": self.similar_idx.nbytes + self.similar_scores.nbytes,
+            "variant_index": self.variants.nbytes if self.variants is not None else 0,
+            "postings": matrix_nbytes(self._postings) if self._postings is not None else 0,
+            "dataframe": int(self.df.memory_usage(deep=True).sum()),
+        }
+        report["total"] = sum(report.values())
+        return report
 
 
-# Module-level singleton — imported by main.py and injected via FastAPI
+# Module-level singleton for scripts (test_confidence.py); the API serves
+# models through the named-dataset registry in ml/registry.py
 model = MLModel()
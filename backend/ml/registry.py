@@ -0,0 +1,248 @@
+"""
+ml/registry.py
+--------------
+Named catalog registry: several datasets (e.g. regional role catalogs with
+INR / USD salaries) served side by side.
+
+- Each dataset's MLModel is loaded lazily on first use.
+- Loaded models are kept in LRU order and evicted once the combined
+  footprint exceeds a memory budget.  Pinned datasets (the default) and
+  the model just requested are never evicted, so an oversized catalog
+  still serves.
+- Vectorizer vocabularies are pooled: datasets that fit an identical
+  vocabulary share one object, and terms of dict vocabularies are interned
+  so overlapping vocabularies share their strings.
+- Cold loads and warm hits are timed separately per dataset (see stats()).
+- Only datasets registered with builtin_fallback (the default catalog) are
+  generated from the built-in roles when their CSV is missing; any other
+  dataset that cannot be loaded raises DatasetUnavailable.
+- An optional on_load(name, model) hook runs after every (re)load, e.g. to
+  warm response caches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from backend.ml.compact import CompactVocabulary, vocabulary_nbytes
+from backend.ml.model import MLModel
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetUnavailable(RuntimeError):
+    """A registered dataset whose catalog could not be loaded."""
+
+
+@dataclass
+class DatasetStats:
+    loads: int = 0
+    hits: int = 0
+    evictions: int = 0
+    load_seconds_total: float = 0.0
+    last_load_seconds: Optional[float] = None
+    hit_seconds_total: float = 0.0
+
+
+class DatasetRegistry:
+    """Thread-safe lazy, memory-budgeted LRU cache of named MLModels."""
+
+    def __init__(
+        self,
+        memory_budget_bytes: int,
+        load_kwargs: Optional[dict[str, Any]] = None,
+        on_load: Optional[Callable[[str, MLModel], None]] = None,
+    ) -> None:
+        self.memory_budget_bytes = memory_budget_bytes
+        self.load_kwargs: dict[str, Any] = dict(load_kwargs or {})
+        self.on_load = on_load
+        self._paths: dict[str, str] = {}
+        self._pinned: set[str] = set()
+        self._builtin_fallback: set[str] = set()
+        self._loaded: OrderedDict[str, MLModel] = OrderedDict()   # LRU: oldest first
+        self._stats: dict[str, DatasetStats] = {}
+        self._vocab_pool: dict[str, tuple[Any, set[str]]] = {}    # digest → (vocab, users)
+        self._vocab_key: dict[str, str] = {}                      # dataset → digest
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+
+    # ------------------------------------------------------------------
+    def register(
+        self,
+        name: str,
+        csv_path: str,
+        pinned: bool = False,
+        builtin_fallback: bool = False,
+    ) -> None:
+        with self._lock:
+            self._paths[name] = csv_path
+            if pinned:
+                self._pinned.add(name)
+            if builtin_fallback:
+                self._builtin_fallback.add(name)
+            self._stats.setdefault(name, DatasetStats())
+            self._load_locks.setdefault(name, threading.Lock())
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._paths)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def name_of(self, ml_model: MLModel) -> Optional[str]:
+        """Dataset name a loaded model is served under (None if evicted)."""
+        with self._lock:
+            return next((n for n, m in self._loaded.items() if m is ml_model), None)
+
+    def get(self, name: str) -> MLModel:
+        """
+        Model for `name`, loading it on first use. KeyError if unregistered,
+        DatasetUnavailable if its catalog cannot be read.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            ml_model = self._loaded.get(name)
+            if ml_model is not None:
+                self._loaded.move_to_end(name)
+                stats = self._stats[name]
+                stats.hits += 1
+                stats.hit_seconds_total += time.perf_counter() - start
+                return ml_model
+            if name not in self._paths:
+                raise KeyError(name)
+            load_lock = self._load_locks[name]
+
+        # Load outside the registry lock so other datasets keep serving;
+        # the per-dataset lock stops concurrent duplicate loads.
+        with load_lock:
+            with self._lock:
+                if name in self._loaded:
+                    self._loaded.move_to_end(name)
+                    self._stats[name].hits += 1
+                    return self._loaded[name]
+            ml_model = MLModel()
+            try:
+                ml_model.load(
+                    self._paths[name],
+                    generate_missing=name in self._builtin_fallback,
+                    **self.load_kwargs,
+                )
+            except (OSError, ValueError, KeyError) as exc:
+                # KeyError here is a malformed CSV (missing column), not an
+                # unknown dataset — don't let it read as one.
+                logger.error("Could not load dataset %r from %s: %s", name, self._paths[name], exc)
+                raise DatasetUnavailable(f"Dataset {name!r} could not be loaded: {exc}") from exc
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._share_vocabulary(name, ml_model)
+                self._loaded[name] = ml_model
+                stats = self._stats[name]
+                stats.loads += 1
+                stats.last_load_seconds = elapsed
+                stats.load_seconds_total += elapsed
+                self._evict_over_budget(keep=name)
+            logger.info("Dataset %r loaded in %.2fs", name, elapsed)
+        if self.on_load is not None:
+            self.on_load(name, ml_model)
+        return ml_model
+
+    # ------------------------------------------------------------------
+    def footprint_bytes(self) -> int:
+        """Combined size of loaded models, counting each pooled vocabulary once."""
+        with self._lock:
+            return self._footprint()
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = []
+            for name, path in self._paths.items():
+                st = self._stats[name]
+                ml_model = self._loaded.get(name)
+                rows.append({
+                    "name": name,
+                    "csv_path": path,
+                    "loaded": ml_model is not None,
+                    "memory_bytes": ml_model.memory_report()["total"] if ml_model else None,
+                    "shared_vocabulary": (
+                        name in self._vocab_key
+                        and len(self._vocab_pool[self._vocab_key[name]][1]) > 1
+                    ),
+                    "loads": st.loads,
+                    "hits": st.hits,
+                    "evictions": st.evictions,
+                    "last_load_ms": (
+                        round(st.last_load_seconds * 1e3, 2)
+                        if st.last_load_seconds is not None else None
+                    ),
+                    "avg_load_ms": round(st.load_seconds_total / st.loads * 1e3, 2) if st.loads else None,
+                    "avg_hit_us": round(st.hit_seconds_total / st.hits * 1e6, 2) if st.hits else None,
+                })
+            return rows
+
+    def close(self) -> None:
+        """Release worker pools of every loaded model (shutdown)."""
+        with self._lock:
+            for ml_model in self._loaded.values():
+                ml_model.close()
+
+    # ── internals (call with self._lock held) ─────────────────────────────
+    def _footprint(self) -> int:
+        total = 0
+        for ml_model in self._loaded.values():
+            report = ml_model.memory_report()
+            total += report["total"] - report["vocabulary"]
+        for vocab, users in self._vocab_pool.values():
+            if users:
+                total += vocabulary_nbytes(vocab)
+        return total
+
+    def _evict_over_budget(self, keep: str) -> None:
+        while self._footprint() > self.memory_budget_bytes:
+            victim = next(
+                (n for n in self._loaded if n != keep and n not in self._pinned), None
+            )
+            if victim is None:
+                break
+            self._loaded.pop(victim).close()
+            self._release_vocabulary(victim)
+            self._stats[victim].evictions += 1
+            logger.info("Evicted dataset %r (memory budget %d bytes)", victim, self.memory_budget_bytes)
+
+    def _share_vocabulary(self, name: str, ml_model: MLModel) -> None:
+        vectorizer = ml_model.vectorizer
+        vocab = vectorizer.vocabulary_
+        # Fitted ids are the terms' sorted rank, so the id-ordered term list
+        # identifies the whole mapping.
+        terms = vocab if isinstance(vocab, CompactVocabulary) else sorted(vocab, key=vocab.__getitem__)
+        digest = hashlib.sha1(
+            (type(vocab).__name__ + "\n" + "\n".join(terms)).encode()
+        ).hexdigest()
+
+        pooled = self._vocab_pool.get(digest)
+        if pooled is not None:
+            vectorizer.vocabulary_ = pooled[0]
+            pooled[1].add(name)
+        else:
+            if not isinstance(vocab, CompactVocabulary):
+                vocab = {sys.intern(t): i for t, i in vocab.items()}
+                vectorizer.vocabulary_ = vocab
+            self._vocab_pool[digest] = (vocab, {name})
+        self._vocab_key[name] = digest
+
+    def _release_vocabulary(self, name: str) -> None:
+        digest = self._vocab_key.pop(name, None)
+        if digest is None:
+            return
+        users = self._vocab_pool[digest][1]
+        users.discard(name)
+        if not users:
+            del self._vocab_pool[digest]
@@ -0,0 +1,213 @@
+"""
+ml/sessions.py
+--------------
+Server-side scoring sessions for interactive skill editing.
+
+A session keeps the user's current skill list, its unnormalised query
+vector u (raw term count × idf) and the dot products X @ u against every
+role.  Adding or removing a skill re-analyses the (short) skill list, diffs
+the term counts, and applies only the changed terms:
+
+    dots += X[:, changed] @ Δu
+
+which reads just those terms' postings instead of rescoring the catalog.
+Cosine scores are dots / ||u|| — the same ranking `/recommend` produces for
+the comma-joined skill list.
+
+Sessions expire after a sliding TTL and are evicted least-recently-used
+once their combined footprint exceeds a memory cap.  The store keeps a
+running total of session sizes, so creating or editing a session costs
+the same however many others are live.
+"""
+
+from __future__ import annotations
+
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+
+from backend.ml.model import MLModel
+from backend.ml.shards import top_k_indices
+
+# Bookkeeping per stored term / skill on top of the dot-product array.
+_ENTRY_OVERHEAD_BYTES = 64
+
+
+def _skill_key(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+class ScoringSession:
+    """One user's skill list and its incrementally maintained role scores."""
+
+    def __init__(self, session_id: str, dataset: str, ml_model: MLModel, max_chars: int) -> None:
+        self.session_id = session_id
+        self.dataset = dataset
+        self.max_chars = max_chars
+        self.skills: list[str] = []
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.accounted_bytes = 0          # size last counted in the store's total
+        self.model: MLModel = ml_model
+        self._counts: dict[int, int] = {}
+        self._dots = np.zeros(len(ml_model.df), dtype=np.float64)
+
+    # ------------------------------------------------------------------
+    def rebind(self, ml_model: MLModel) -> None:
+        """Recompute from scratch against a different (e.g. reloaded) model."""
+        self.model = ml_model
+        self._counts = {}
+        self._dots = np.zeros(len(ml_model.df), dtype=np.float64)
+        self._apply(ml_model.query_term_counts(", ".join(self.skills)))
+
+    def update(self, add: Iterable[str] = (), remove: Iterable[str] = ()) -> None:
+        """
+        Remove, then append, skills (case-insensitive; duplicates ignored).
+        ValueError — leaving the session unchanged — if the resulting skill
+        list would exceed max_chars.
+        """
+        dropped = {_skill_key(s) for s in remove}
+        skills = [s for s in self.skills if _skill_key(s) not in dropped]
+        present = {_skill_key(s) for s in skills}
+        for skill in add:
+            skill = skill.strip()
+            if skill and _skill_key(skill) not in present:
+                skills.append(skill)
+                present.add(_skill_key(skill))
+
+        text = ", ".join(skills)
+        if len(text) > self.max_chars:
+            raise ValueError(f"Skill list exceeds {self.max_chars} characters.")
+        self.skills = skills
+        self._apply(self.model.query_term_counts(text))
+
+    def _apply(self, counts: dict[int, int]) -> None:
+        changed = [j for j in counts.keys() | self._counts.keys()
+                   if counts.get(j, 0) != self._counts.get(j, 0)]
+        if changed:
+            term_ids = np.fromiter(changed, dtype=np.intp, count=len(changed))
+            delta = np.array(
+                [counts.get(j, 0) - self._counts.get(j, 0) for j in changed], dtype=np.float64
+            )
+            self.model.add_term_columns(self._dots, term_ids, delta * self.model.vectorizer.idf_[term_ids])
+        self._counts = counts
+        if not counts:
+            self._dots[:] = 0.0     # drop accumulated rounding once the query is empty
+
+    # ------------------------------------------------------------------
+    def scores(self) -> np.ndarray:
+        """Cosine similarity of the current skill list to every role."""
+        if not self._counts:
+            return np.zeros_like(self._dots)
+        ids = np.fromiter(self._counts.keys(), dtype=np.intp, count=len(self._counts))
+        tf = np.fromiter(self._counts.values(), dtype=np.float64, count=len(self._counts))
+        norm = float(np.linalg.norm(tf * self.model.vectorizer.idf_[ids]))
+        # Clip rounding residue (-1e-17) left on rows whose terms were removed.
+        return np.maximum(self._dots / norm, 0.0)
+
+    def top_k(self, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Row indices and cosine scores of the k best roles, best first."""
+        scores = self.scores()
+        idx = top_k_indices(scores, k)
+        return idx, scores[idx]
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self._dots.nbytes
+            + _ENTRY_OVERHEAD_BYTES * len(self._counts)
+            + sum(sys.getsizeof(s) + _ENTRY_OVERHEAD_BYTES for s in self.skills)
+        )
+
+
+class SessionStore:
+    """Thread-safe sessions with a sliding TTL and a total memory cap (LRU)."""
+
+    def __init__(self, ttl_seconds: float, max_bytes: int, max_chars: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self._sessions: OrderedDict[str, ScoringSession] = OrderedDict()   # oldest first
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # ------------------------------------------------------------------
+    def create(self, dataset: str, ml_model: MLModel, skills: Iterable[str] = ()) -> ScoringSession:
+        """New session scored against `ml_model`. ValueError if skills are too long."""
+        session = ScoringSession(secrets.token_urlsafe(16), dataset, ml_model, self.max_chars)
+        session.update(add=skills)
+        with self._lock:
+            self._expire(time.monotonic())
+            self._sessions[session.session_id] = session
+            self._account(session)
+            self._evict_over_cap(keep=session.session_id)
+        return session
+
+    def get(self, session_id: str) -> ScoringSession:
+        """Live session by id, refreshing its TTL. KeyError if unknown or expired."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions[session_id]
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._remove(session_id) is not None
+
+    def enforce_cap(self, session: ScoringSession) -> None:
+        """Re-count a session that changed size (update, rebind) and apply the memory cap."""
+        with self._lock:
+            if self._sessions.get(session.session_id) is session:
+                self._account(session)
+                self._evict_over_cap(keep=session.session_id)
+
+    def expires_in(self, session: ScoringSession) -> float:
+        return max(0.0, session.last_used + self.ttl_seconds - time.monotonic())
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes
+
+    # ── internals (call with self._lock held) ─────────────────────────────
+    def _expire(self, now: float) -> None:
+        # Sessions are kept in last-used order, so expired ones are at the front.
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_used < self.ttl_seconds:
+                break
+            self._remove(oldest.session_id)
+            self.expirations += 1
+
+    def _account(self, session: ScoringSession) -> None:
+        size = session.nbytes
+        self._total_bytes += size - session.accounted_bytes
+        session.accounted_bytes = size
+
+    def _remove(self, session_id: str) -> Optional[ScoringSession]:
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._total_bytes -= session.accounted_bytes
+            session.accounted_bytes = 0
+        return session
+
+    def _evict_over_cap(self, keep: Optional[str]) -> None:
+        # Oldest first; each victim is found at the front of the LRU order.
+        while self._total_bytes > self.max_bytes:
+            victim = next((sid for sid in self._sessions if sid != keep), None)
+            if victim is None:
+                break
+            self._remove(victim)
+            self.evictions += 1
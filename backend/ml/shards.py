@@ -0,0 +1,178 @@
+"""
+ml/shards.py
+------------
+Row-sharded parallel scoring for catalogs too large for one core.
+
+X is split into contiguous row shards.  Each shard is scored on a worker
+(threads by default, since sparse / BLAS matmul releases the GIL, or
+processes) and reduced to a local top-k, and the candidates are merged
+into the global top-k.  Every row's score is computed by the same kernel
+as the unsharded path, and ties are broken by row index at both the local
+and the merge step, so results are identical to scoring X in one piece.
+
+With processes, each shard gets its own single-worker pool that holds
+only that shard, so the workers together keep one extra copy of X.
+
+The pools are only shut down once no call is using them: ``close()`` on
+a scorer with calls in flight (a model evicted mid-request) leaves the
+shutdown to the last of them, and later calls score inline.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+
+def score_matrix(user_vec, X) -> np.ndarray:
+    """Cosine scores of one query (1 × V sparse, L2-normalised) against X's rows."""
+    if isinstance(X, np.ndarray):
+        # Rows of X and the query are already L2-normalised by the
+        # vectorizer, so cosine similarity is a plain BLAS matvec.
+        return X @ user_vec.toarray().ravel()
+    return cosine_similarity(user_vec, X).flatten()
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k best scores, best first; equal scores in index order.
+    O(n) selection plus a sort of the k winners.
+    """
+    n = len(scores)
+    if k >= n:
+        idx = np.arange(n)
+    elif k <= 0:
+        return np.empty(0, dtype=np.intp)
+    else:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[: k - len(above)]
+        idx = np.concatenate([above, tied])
+    return idx[np.lexsort((idx, -scores[idx]))]
+
+
+# ── Process-pool workers (module level so they pickle) ──────────────────────
+# Each process pool has a single worker holding only its own shard.
+_WORKER_SHARD = None
+
+
+def _init_worker(shard) -> None:
+    global _WORKER_SHARD
+    _WORKER_SHARD = shard
+
+
+def _process_top_k(user_vec, k: int) -> tuple[np.ndarray, np.ndarray]:
+    return _shard_top_k(_WORKER_SHARD, user_vec, k)
+
+
+def _process_scores(user_vec) -> np.ndarray:
+    return score_matrix(user_vec, _WORKER_SHARD)
+
+
+def _shard_scores(X, user_vec) -> np.ndarray:
+    return score_matrix(user_vec, X)
+
+
+def _shard_top_k(X, user_vec, k: int) -> tuple[np.ndarray, np.ndarray]:
+    scores = score_matrix(user_vec, X)
+    idx = top_k_indices(scores, k)
+    return idx, scores[idx]
+
+
+class ShardedScorer:
+    """Row shards of X plus the worker pool(s) that score them."""
+
+    def __init__(self, X, n_shards: int, executor: str = "thread") -> None:
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown shard executor: {executor!r}")
+        n_rows = X.shape[0]
+        n_shards = max(1, min(n_shards, n_rows))
+        bounds = np.linspace(0, n_rows, n_shards + 1).astype(int)
+        self.offsets: list[int] = [int(b) for b in bounds[:-1]]
+        self.shards: list = [X[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+        self.executor_kind = executor
+
+        # Threads share X, so one pool serves every shard.  Processes get one
+        # single-worker pool per shard, initialised with that shard only, so
+        # the workers together hold one copy of X (not n_shards copies)
+        # whatever the start method.
+        self._pools: list[Executor]
+        if executor == "thread":
+            self._pools = [ThreadPoolExecutor(max_workers=n_shards, thread_name_prefix="score-shard")]
+        else:
+            self._pools = [
+                ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=(shard,))
+                for shard in self.shards
+            ]
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    # ------------------------------------------------------------------
+    def _acquire(self) -> list[Executor]:
+        with self._lock:
+            if self._closing:
+                return []
+            self._in_flight += 1
+            return self._pools
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            pools = self._pools if self._closing and self._in_flight == 0 else []
+            if pools:
+                self._pools = []
+        for pool in pools:
+            pool.shutdown(wait=False)
+
+    def _map(self, thread_fn: Callable, process_fn: Callable, *args: Any) -> list:
+        """Run one task per shard on the pool(s), or inline once the scorer is closed."""
+        pools = self._acquire()
+        if not pools:
+            return [thread_fn(X, *args) for X in self.shards]
+        try:
+            if self.executor_kind == "thread":
+                futures = [pools[0].submit(thread_fn, X, *args) for X in self.shards]
+            else:
+                futures = [pool.submit(process_fn, *args) for pool in pools]
+            return [f.result() for f in futures]
+        finally:
+            self._release()
+
+    def scores(self, user_vec) -> np.ndarray:
+        """Scores for every row, computed shard by shard in parallel."""
+        return np.concatenate(self._map(_shard_scores, _process_scores, user_vec))
+
+    def top_k(self, user_vec, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Global (row indices, scores) of the k best rows, best first."""
+        results = self._map(_shard_top_k, _process_top_k, user_vec, k)
+
+        idx_parts, score_parts = [], []
+        for offset, (idx, scores) in zip(self.offsets, results):
+            idx_parts.append(idx + offset)
+            score_parts.append(scores)
+        candidates = np.concatenate(idx_parts)
+        cand_scores = np.concatenate(score_parts)
+        # Candidates are in ascending row order within and across shards,
+        # so index-order tie-breaking on positions matches global row order.
+        order = np.argsort(candidates, kind="stable")
+        candidates, cand_scores = candidates[order], cand_scores[order]
+        best = top_k_indices(cand_scores, k)
+        return candidates[best], cand_scores[best]
+
+    def close(self) -> None:
+        """Stop accepting pool work; the pools shut down once in-flight calls finish."""
+        with self._lock:
+            self._closing = True
+            pools = self._pools if self._in_flight == 0 else []
+            if pools:
+                self._pools = []
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,67 @@
+"""
+ml/suggest.py
+-------------
+Prefix index over known skill names for per-keystroke autocomplete.
+
+Every prefix of every skill (and of every word inside a multi-word skill,
+so "lea" finds "machine learning") maps to its top suggestions, ranked
+ahead of time.  A lookup is a single dict hit returning a shared tuple —
+nothing proportional to the vocabulary is scanned or allocated per call.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Iterable
+
+
+class SkillSuggester:
+    """Precomputed prefix → top-N skills table, ranked by document frequency."""
+
+    def __init__(
+        self,
+        role_skill_lists: Iterable[Iterable[str]],
+        extra_skills: Iterable[str] = (),
+        max_results: int = 10,
+        max_prefix_len: int = 30,
+    ) -> None:
+        doc_freq: Counter = Counter()
+        for skills in role_skill_lists:
+            doc_freq.update({s.strip().lower() for s in skills if s.strip()})
+        for skill in extra_skills:
+            skill = skill.strip().lower()
+            if skill:
+                doc_freq.setdefault(skill, 0)
+
+        # Most common first; shorter, then alphabetical, breaks ties.
+        ranked = sorted(doc_freq, key=lambda s: (-doc_freq[s], len(s), s))
+
+        buckets: dict[str, list[str]] = defaultdict(list)
+        for skill in ranked:
+            prefixes: set[str] = set()
+            starts = [0] + [i + 1 for i, ch in enumerate(skill) if ch == " "]
+            for start in starts:
+                word = skill[start:start + max_prefix_len]
+                prefixes.update(word[:n] for n in range(1, len(word) + 1))
+            for prefix in prefixes:
+                bucket = buckets[prefix]
+                if len(bucket) < max_results:
+                    bucket.append(skill)
+
+        self.max_results = max_results
+        self.max_prefix_len = max_prefix_len
+        self.doc_freq: dict[str, int] = dict(doc_freq)
+        self._table: dict[str, tuple[str, ...]] = {p: tuple(b) for p, b in buckets.items()}
+
+    # ------------------------------------------------------------------
+    def suggest(self, prefix: str, limit: int = 8) -> tuple[str, ...]:
+        """Top `limit` skills starting with `prefix` (case-insensitive)."""
+        key = prefix.strip().lower()
+        hits = self._table.get(key[:self.max_prefix_len], ())
+        if len(key) > self.max_prefix_len:
+            # Rare: longer than the indexed depth — filter the indexed bucket.
+            hits = tuple(h for h in hits if key in h)
+        return hits if limit >= len(hits) else hits[:limit]
+
+    def __len__(self) -> int:
+        return len(self.doc_freq)
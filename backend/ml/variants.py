@@ -0,0 +1,102 @@
+"""
+ml/variants.py
+--------------
+Seniority-variant families ("Data Scientist", "Junior Data Scientist",
+"Senior Data Scientist") scored through one shared vector per family.
+
+Variants differ from their base role by a handful of appended skills, so
+their unnormalised TF-IDF vectors share almost every entry.  Each row is
+split into
+
+    u_row = B[family] + D[row]
+
+where B[family] is the element-wise minimum over the family's members (the
+part they all have) and D[row] is the small per-variant remainder.  Cosine
+similarity against an L2-normalised query q is then
+
+    cos(q, row) = (q · B[family] + q · D[row]) / ||u_row||
+
+— the large shared dot product is computed once per family, and the
+result equals scoring the full matrix up to floating-point rounding (the
+sums are associated differently, so roles that tie to the last bit may
+swap places).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+_SENIORITY_RE = re.compile(r"^(junior|senior|lead|staff|principal)\s+", flags=re.IGNORECASE)
+
+
+def strip_seniority(role: str) -> str:
+    """'Senior Data Scientist' → 'Data Scientist'; other titles unchanged."""
+    return _SENIORITY_RE.sub("", role).strip()
+
+
+class VariantIndex:
+    """Family-factored TF-IDF matrix: shared vectors B, deltas D, row norms."""
+
+    def __init__(
+        self,
+        roles: Iterable[str],
+        vectorizer: TfidfVectorizer,
+        cleaned_docs: Iterable[str],
+    ) -> None:
+        keys = [strip_seniority(str(r)).lower() for r in roles]
+        family_of, _ = pd.factorize(pd.Series(keys))
+        family_of = family_of.astype(np.int32)
+        n_families = int(family_of.max()) + 1 if len(family_of) else 0
+
+        # Unnormalised TF-IDF rows: raw term counts × idf (what the
+        # vectorizer computes before its L2 step).
+        counts = CountVectorizer.transform(vectorizer, cleaned_docs)
+        U = sp.csr_matrix(counts.multiply(vectorizer.idf_), dtype=vectorizer.dtype)
+        n_cols = U.shape[1]
+
+        # Shared part: entries present in every member, at their minimum.
+        coo = U.tocoo()
+        key = family_of[coo.row].astype(np.int64) * n_cols + coo.col
+        order = np.argsort(key, kind="stable")
+        key, vals = key[order], coo.data[order]
+        uniq, starts, hits = np.unique(key, return_index=True, return_counts=True)
+        if len(uniq):
+            mins = np.minimum.reduceat(vals, starts)
+        else:
+            mins = vals
+        shared = hits == np.bincount(family_of, minlength=n_families)[uniq // n_cols]
+        B = sp.csr_matrix(
+            (mins[shared], (uniq[shared] // n_cols, uniq[shared] % n_cols)),
+            shape=(n_families, n_cols),
+            dtype=U.dtype,
+        )
+        D = sp.csr_matrix(U - B[family_of])
+        D.eliminate_zeros()
+
+        norms = np.sqrt(np.asarray(U.multiply(U).sum(axis=1)).ravel())
+        inv_norm = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+
+        self.family_of: np.ndarray = family_of
+        self.n_families: int = n_families
+        self.B = B
+        self.D = D
+        self.inv_norm: np.ndarray = inv_norm.astype(U.dtype)
+
+    # ------------------------------------------------------------------
+    def scores(self, query) -> np.ndarray:
+        """Cosine scores for every row, given the L2-normalised query (1 × V sparse)."""
+        q = query.toarray().ravel()
+        shared = self.B @ q
+        return (shared[self.family_of] + self.D @ q) * self.inv_norm
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in (self.B, self.D)
+        ) + self.family_of.nbytes + self.inv_norm.nbytes
@@ -6,7 +6,7 @@ Pydantic v2 models for all API request / response contracts.
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional, get_args
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -15,13 +15,35 @@ from pydantic import BaseModel, Field, field_validator
 # Request
 # ---------------------------------------------------------------------------
 
+# Upper bound on the skills string — also caps skills extracted from resumes.
+MAX_SKILLS_LENGTH: int = 2000
+
+# Optional per-role fields a client can select with `fields`.
+# `role` is always returned — it identifies the recommendation.
+RoleField = Literal[
+    "match_score",
+    "avg_salary",
+    "strengths",
+    "missing_skills",
+    "resources",
+    "action_plan",
+    "mini_projects",
+    "headline",
+    "low_confidence",
+    "similar_roles",
+]
+
+# Fields returned when `fields` is omitted — everything except opt-in extras.
+DEFAULT_ROLE_FIELDS: frozenset = frozenset(get_args(RoleField)) - {"similar_roles"}
+
+
 class RecommendRequest(BaseModel):
     """Body for POST /recommend."""
 
     skills: str = Field(
         ...,
         min_length=2,
-        max_length=2000,
+        max_length=MAX_SKILLS_LENGTH,
         description="Comma-separated skills string, e.g. 'python, sql, pandas'",
         examples=["python, sql, pandas"],
     )
@@ -31,6 +53,22 @@ class RecommendRequest(BaseModel):
         le=10,
         description="Number of top role recommendations to return (1-10)",
     )
+    fields: Optional[List[RoleField]] = Field(
+        default=None,
+        description=(
+            "Sparse fieldset — only these per-role fields are computed and returned "
+            "(`role` is always included). Omit for the full response; "
+            "`similar_roles` is opt-in and only returned when listed here."
+        ),
+        examples=[["match_score", "avg_salary"]],
+    )
+    collapse_variants: bool = Field(
+        default=False,
+        description=(
+            "Return only the best-scoring seniority variant (Junior / Senior / …) "
+            "of each role, freeing top-N slots for genuinely different roles"
+        ),
+    )
 
     @field_validator("skills")
     @classmethod
@@ -41,6 +79,13 @@ class RecommendRequest(BaseModel):
         return stripped
 
 
+class ResumeOptions(BaseModel):
+    """Form fields sent alongside the `file` part of POST /recommend/resume."""
+
+    top_n: int = Field(default=3, ge=1, le=10, description="Number of top roles to return (1-10)")
+    collapse_variants: bool = Field(default=False, description="Keep only the best variant of each role")
+
+
 # ---------------------------------------------------------------------------
 # Response ── nested building blocks
 # ---------------------------------------------------------------------------
@@ -51,21 +96,30 @@ LOW_CONFIDENCE_THRESHOLD: float = 45.0  # percent
 
 
 class RoleRecommendation(BaseModel):
-    """A single recommended career role with full details."""
+    """
+    A single recommended career role with full details.
+
+    Every field except `role` may be left unset when the request carries a
+    sparse `fields` selection; unset fields are omitted from the response.
+    """
 
     role: str = Field(..., description="Job role title")
-    match_score: float = Field(..., description="Cosine-similarity match score as a percentage (0-100)")
-    avg_salary: int = Field(..., description="Average annual salary in INR")
-    strengths: List[str] = Field(..., description="Skills the user already has that match this role")
-    missing_skills: List[str] = Field(..., description="Skills gaps — things to learn next")
-    resources: List[str] = Field(..., description="Curated learning resources for the missing skills")
-    action_plan: List[str] = Field(..., description="4-week personalised learning roadmap")
-    mini_projects: List[str] = Field(..., description="Suggested hands-on projects for this role")
-    headline: str = Field(..., description="Motivational headline based on match score")
+    match_score: Optional[float] = Field(default=None, description="Cosine-similarity match score as a percentage (0-100)")
+    avg_salary: Optional[int] = Field(default=None, description="Average annual salary in INR")
+    strengths: Optional[List[str]] = Field(default=None, description="Skills the user already has that match this role")
+    missing_skills: Optional[List[str]] = Field(default=None, description="Skills gaps — things to learn next")
+    resources: Optional[List[str]] = Field(default=None, description="Curated learning resources for the missing skills")
+    action_plan: Optional[List[str]] = Field(default=None, description="4-week personalised learning roadmap")
+    mini_projects: Optional[List[str]] = Field(default=None, description="Suggested hands-on projects for this role")
+    headline: Optional[str] = Field(default=None, description="Motivational headline based on match score")
     low_confidence: bool = Field(
         default=False,
         description="True when match score is below the confidence threshold — results are approximate",
     )
+    similar_roles: Optional[List[str]] = Field(
+        default=None,
+        description="Nearest other roles by skill profile (opt-in via `fields`)",
+    )
 
 
 class RecommendResponse(BaseModel):
@@ -84,11 +138,159 @@ class RecommendResponse(BaseModel):
     )
 
 
+# ---------------------------------------------------------------------------
+# What-if skill uplift
+# ---------------------------------------------------------------------------
+
+class WhatIfRequest(BaseModel):
+    """Body for POST /recommend/what-if."""
+
+    skills: str = Field(
+        ...,
+        min_length=2,
+        max_length=MAX_SKILLS_LENGTH,
+        description="Comma-separated skills string, e.g. 'python, sql'",
+        examples=["python, sql"],
+    )
+    role: str = Field(..., min_length=1, description="Target role (case-insensitive)", examples=["Data Scientist"])
+    limit: Optional[int] = Field(default=None, ge=1, le=50, description="Return only the best N candidates")
+
+    @field_validator("skills")
+    @classmethod
+    def skills_not_empty(cls, v: str) -> str:
+        stripped = v.strip()
+        if not stripped:
+            raise ValueError("skills must not be blank")
+        return stripped
+
+
+class SkillUplift(BaseModel):
+    skill: str = Field(..., description="Missing skill of the target role")
+    match_score: float = Field(..., description="Calibrated match score after adding this skill (0-100)")
+    uplift: float = Field(..., description="match_score minus the current match score, in points")
+
+
+class WhatIfResponse(BaseModel):
+    """Response for POST /recommend/what-if."""
+
+    role: str = Field(..., description="The target role, as named in the dataset")
+    current_score: float = Field(..., description="Calibrated match score for the skills as given")
+    candidates: List[SkillUplift] = Field(..., description="Missing skills, largest uplift first")
+
+
+# ---------------------------------------------------------------------------
+# Similar roles
+# ---------------------------------------------------------------------------
+
+class SimilarRole(BaseModel):
+    role: str = Field(..., description="Job role title")
+    similarity: float = Field(..., description="Cosine similarity between the two roles' skill profiles (0-1)")
+
+
+class SimilarRolesResponse(BaseModel):
+    """Response for GET /roles/{role}/similar."""
+
+    role: str = Field(..., description="The queried role, as named in the dataset")
+    similar: List[SimilarRole]
+
+
+# ---------------------------------------------------------------------------
+# Skill autocomplete
+# ---------------------------------------------------------------------------
+
+class SkillSuggestResponse(BaseModel):
+    """Response for GET /skills/suggest."""
+
+    prefix: str = Field(..., description="Echo of the typed prefix")
+    suggestions: List[str] = Field(..., description="Known skills, most common across roles first")
+
+
+# ---------------------------------------------------------------------------
+# Scoring sessions
+# ---------------------------------------------------------------------------
+
+class SessionCreateRequest(BaseModel):
+    """Body for POST /sessions."""
+
+    skills: List[str] = Field(
+        default_factory=list,
+        description="Initial skills, one per entry (may be empty)",
+        examples=[["python", "sql"]],
+    )
+    top_n: int = Field(default=3, ge=1, le=10, description="Number of top roles to return (1-10)")
+
+
+class SessionUpdateRequest(BaseModel):
+    """Body for PATCH /sessions/{session_id}."""
+
+    add: List[str] = Field(default_factory=list, description="Skills to add", examples=[["pandas"]])
+    remove: List[str] = Field(default_factory=list, description="Skills to remove (case-insensitive)")
+    top_n: int = Field(default=3, ge=1, le=10, description="Number of top roles to return (1-10)")
+
+
+class RankedRole(BaseModel):
+    role: str = Field(..., description="Job role title")
+    match_score: float = Field(..., description="Calibrated match score as a percentage (0-100)")
+    avg_salary: int = Field(..., description="Average annual salary in INR")
+    low_confidence: bool = Field(..., description="True when match score is below the confidence threshold")
+
+
+class SessionResponse(BaseModel):
+    """Current state of a scoring session and its top-N roles."""
+
+    session_id: str
+    dataset: str
+    skills: List[str] = Field(..., description="The session's skills, in the order they were added")
+    recommendations: List[RankedRole]
+    no_strong_match: bool = Field(..., description="True when ALL returned roles are low-confidence")
+    expires_in_seconds: float = Field(..., description="Idle time left before the session expires")
+
+
 # ---------------------------------------------------------------------------
 # Health-check
 # ---------------------------------------------------------------------------
 
+class WarmupStatus(BaseModel):
+    """Progress of the background cache warmup after the model was (re)loaded."""
+
+    state: Literal["pending", "running", "done"]
+    total: int = Field(..., description="Hot queries selected for warmup")
+    completed: int = Field(..., description="Responses precomputed so far")
+    failed: int
+    elapsed_ms: float
+    budget_ms: float
+    stopped_by_budget: bool = Field(..., description="True when the time budget ended the warmup early")
+
+
 class HealthResponse(BaseModel):
     status: str
     model_ready: bool
     dataset_rows: Optional[int] = None
+    warmup: Optional[WarmupStatus] = None
+
+
+# ---------------------------------------------------------------------------
+# Datasets
+# ---------------------------------------------------------------------------
+
+class DatasetInfo(BaseModel):
+    name: str
+    csv_path: str
+    loaded: bool
+    memory_bytes: Optional[int] = Field(default=None, description="Approximate footprint while loaded")
+    shared_vocabulary: bool = Field(..., description="Vocabulary object shared with another loaded dataset")
+    loads: int = Field(..., description="Cold loads (first use or after eviction)")
+    hits: int = Field(..., description="Requests served by an already-loaded model")
+    evictions: int
+    last_load_ms: Optional[float] = None
+    avg_load_ms: Optional[float] = Field(default=None, description="Mean cold-load latency")
+    avg_hit_us: Optional[float] = Field(default=None, description="Mean warm-hit lookup latency")
+
+
+class DatasetsResponse(BaseModel):
+    """Response for GET /datasets."""
+
+    default: str
+    memory_budget_bytes: int
+    memory_used_bytes: int
+    datasets: List[DatasetInfo]
@@ -0,0 +1,258 @@
+"""
+tracing.py
+----------
+Lightweight request tracing with tail-based sampling.
+
+Each HTTP request gets a trace (opened by TracingMiddleware); code on the
+request path wraps interesting sections in ``span("name", **attrs)``.
+Spans are buffered per request and only handed to the exporter when the
+request finishes — always when it was slower than the configured
+threshold, otherwise with a small random probability.  Outside a request
+(scripts, startup) ``span()`` is a no-op.
+
+Span records use OTLP field names (traceId, spanId, parentSpanId,
+startTimeUnixNano, …) so an OTLP exporter can be dropped in through the
+``SpanExporter`` interface; the default writes them as JSON lines to a
+size-rotated local file.
+
+Usage
+-----
+    from backend.tracing import span, set_trace_attributes
+
+    with span("similarity_scores", rows=n):
+        ...
+    set_trace_attributes(top_n=3)
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import os
+import random
+import secrets
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------------
+class SpanExporter(ABC):
+    """Interface for span sinks. Subclass and implement export()."""
+
+    @abstractmethod
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        ...
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonlFileExporter(SpanExporter):
+    """One JSON object per span, appended to a size-rotated local file."""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        for record in spans:
+            self._handler.emit(logging.makeLogRecord({"msg": json.dumps(record)}))
+
+    def shutdown(self) -> None:
+        self._handler.close()
+
+
+def load_exporter(dotted_path: str, **kwargs: Any) -> SpanExporter:
+    """Instantiate an exporter class given as 'package.module:ClassName'."""
+    module_name, _, class_name = dotted_path.partition(":")
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls(**kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Tracer
+# ---------------------------------------------------------------------------
+class _Trace:
+    __slots__ = ("trace_id", "spans", "attributes")
+
+    def __init__(self) -> None:
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[dict[str, Any]] = []
+        self.attributes: dict[str, Any] = {}
+
+
+_current_trace: ContextVar[Optional[_Trace]] = ContextVar("current_trace", default=None)
+_current_span_id: ContextVar[Optional[str]] = ContextVar("current_span_id", default=None)
+
+
+class Tracer:
+    """Holds the exporter and the tail-sampling policy."""
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        slow_ms: float = 250.0,
+        sample_rate: float = 0.0,
+    ) -> None:
+        self.exporter = exporter
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+
+    def configure(
+        self,
+        exporter: Optional[SpanExporter],
+        slow_ms: float,
+        sample_rate: float,
+    ) -> None:
+        if self.exporter is not None and self.exporter is not exporter:
+            self.exporter.shutdown()
+        self.exporter = exporter
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def should_keep(self, duration_ms: float) -> bool:
+        return duration_ms >= self.slow_ms or (
+            self.sample_rate > 0 and random.random() < self.sample_rate
+        )
+
+    def finish(self, trace: _Trace, duration_ms: float) -> None:
+        if not trace.spans or not self.should_keep(duration_ms):
+            return
+        # Request-level attributes (sizes, top_n, …) go on the root span.
+        trace.spans[-1]["attributes"].update(trace.attributes)
+        try:
+            self.exporter.export(trace.spans)
+        except Exception:   # tracing must never break a request
+            logger.exception("Span export failed")
+
+
+tracer = Tracer()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[None]:
+    """Record a timed span inside the current request's trace (no-op outside one)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    span_id = secrets.token_hex(8)
+    parent_id = _current_span_id.get()
+    token = _current_span_id.set(span_id)
+    start = time.time_ns()
+    try:
+        yield
+    finally:
+        end = time.time_ns()
+        _current_span_id.reset(token)
+        trace.spans.append({
+            "traceId": trace.trace_id,
+            "spanId": span_id,
+            "parentSpanId": parent_id,
+            "name": name,
+            "startTimeUnixNano": start,
+            "endTimeUnixNano": end,
+            "durationMs": round((end - start) / 1e6, 3),
+            "attributes": attributes,
+        })
+
+
+def set_trace_attributes(**attributes: Any) -> None:
+    """Attach request-level attributes (sizes and counts only — never raw input)."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes.update(attributes)
+
+
+# ---------------------------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------------------------
+class TracingMiddleware:
+    """
+    Opens a trace per HTTP request and closes it once the last body chunk
+    has been sent, so streamed responses are timed end to end.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = _Trace()
+        trace_token = _current_trace.set(trace)
+        root_id = secrets.token_hex(8)
+        span_token = _current_span_id.set(root_id)
+        start = time.time_ns()
+        status_code = 500
+        content_length = 0
+        request_length = next(
+            (int(v) for k, v in scope.get("headers", ()) if k == b"content-length"), 0
+        )
+        finished = False
+
+        def close() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            end = time.time_ns()
+            attributes = {
+                "http.method": scope["method"],
+                "http.status_code": status_code,
+                "http.request_content_length": request_length,
+                "http.response_content_length": content_length,
+            }
+            # The router sets scope["route"] once a route matched; its
+            # template ("/sessions/{session_id}") keeps ids and role names
+            # out of the span log.  Unmatched requests are named by method.
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                attributes["http.route"] = route
+            trace.spans.append({
+                "traceId": trace.trace_id,
+                "spanId": root_id,
+                "parentSpanId": None,
+                "name": f"{scope['method']} {route}" if route is not None else scope["method"],
+                "startTimeUnixNano": start,
+                "endTimeUnixNano": end,
+                "durationMs": round((end - start) / 1e6, 3),
+                "attributes": attributes,
+            })
+            tracer.finish(trace, (end - start) / 1e6)
+
+        async def traced_send(message) -> None:
+            nonlocal status_code, content_length
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                content_length += len(message.get("body", b""))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                close()
+
+        try:
+            await self.app(scope, receive, traced_send)
+        finally:
+            close()
+            _current_span_id.reset(span_token)
+            _current_trace.reset(trace_token)
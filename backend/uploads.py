@@ -0,0 +1,142 @@
+"""
+uploads.py
+----------
+Streaming multipart/form-data parsing for resume uploads.
+
+FastAPI's ``UploadFile`` receives and spools the whole body before the
+handler runs, so a size limit checked there only fires after an upload of
+any size has been accepted and written to disk.  ``ResumeUpload`` instead
+parses the body as it arrives from ``request.stream()``: the ``file``
+part is fed straight into a ``SkillScanner`` and counted against the
+limit, small form fields are buffered, and everything else is dropped.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+try:                                     # python-multipart ≥ 0.0.13
+    from python_multipart.multipart import MultipartParser, parse_options_header
+    from python_multipart.exceptions import FormParserError
+except ImportError:                      # older releases ship as `multipart`
+    from multipart.multipart import MultipartParser, parse_options_header
+    from multipart.exceptions import FormParserError
+
+from backend.ml.extract import SkillScanner
+
+# Form fields other than `file` that are kept, and their size cap.
+_FORM_FIELDS = frozenset({"top_n", "collapse_variants"})
+_MAX_FIELD_BYTES = 64
+# Allowance for multipart framing and the form fields on top of the file.
+FORM_OVERHEAD_BYTES = 16 * 1024
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class UnsupportedUpload(ValueError):
+    pass
+
+
+class MalformedUpload(ValueError):
+    pass
+
+
+def multipart_boundary(content_type: str) -> bytes:
+    """Boundary of a multipart/form-data Content-Type header."""
+    media_type, options = parse_options_header(content_type)
+    boundary = options.get(b"boundary")
+    if media_type != b"multipart/form-data" or not boundary:
+        raise UnsupportedUpload("Send the resume as multipart/form-data.")
+    return boundary
+
+
+def _is_text(content_type: bytes) -> bool:
+    media_type = parse_options_header(content_type)[0].decode("latin-1").lower()
+    return not media_type or media_type.startswith("text/") or media_type == "application/octet-stream"
+
+
+class ResumeUpload:
+    """Incremental parse of one resume upload; feed it the body with ``write``."""
+
+    def __init__(
+        self,
+        boundary: bytes,
+        scanner: SkillScanner,
+        max_file_bytes: int,
+        chunk_bytes: int,
+    ) -> None:
+        self.scanner = scanner
+        self.max_file_bytes = max_file_bytes
+        self.chunk_bytes = chunk_bytes
+        self.fields: dict[str, str] = {}
+        self.has_file = False
+        self.file_bytes = 0
+        self._part: Optional[str] = None           # form name of the current part
+        self._headers: dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._field_value = bytearray()
+        self._parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def write(self, data: bytes) -> None:
+        try:
+            self._parser.write(data)
+        except FormParserError as exc:
+            raise MalformedUpload(f"Malformed multipart body: {exc}") from None
+
+    def finish(self) -> None:
+        try:
+            self._parser.finalize()
+        except FormParserError as exc:
+            raise MalformedUpload(f"Malformed multipart body: {exc}") from None
+
+    # ── parser callbacks ──────────────────────────────────────────────────
+    def _on_part_begin(self) -> None:
+        self._part = None
+        self._headers = {}
+        self._field_value = bytearray()
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._part = options.get(b"name", b"").decode("latin-1")
+        if self._part == "file":
+            if not _is_text(self._headers.get(b"content-type", b"")):
+                raise UnsupportedUpload("Upload a plain-text or Markdown resume.")
+            self.has_file = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._part == "file":
+            self.file_bytes += end - start
+            if self.file_bytes > self.max_file_bytes:
+                raise UploadTooLarge(f"Resume exceeds {self.max_file_bytes} bytes.")
+            for i in range(start, end, self.chunk_bytes):
+                self.scanner.feed(data[i:min(i + self.chunk_bytes, end)])
+        elif self._part in _FORM_FIELDS:
+            self._field_value += data[start:end]
+            if len(self._field_value) > _MAX_FIELD_BYTES:
+                raise MalformedUpload(f"Form field {self._part!r} is too long.")
+
+    def _on_part_end(self) -> None:
+        if self._part in _FORM_FIELDS:
+            self.fields[self._part] = self._field_value.decode("utf-8", errors="replace")
+        self._part = None
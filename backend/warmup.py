@@ -0,0 +1,257 @@
+"""
+warmup.py
+---------
+Access-log-driven cache warming.
+
+- ``QuerySketch`` counts canonical request keys in a count-min sketch
+  (fixed memory, conservative update) and keeps the hottest ones in a
+  top-K table.  It is saved to a small local JSON file periodically and
+  reloaded at startup, so popularity survives deploys.
+- ``ResponseCache`` holds finished /recommend responses per loaded model
+  (LRU).  Entries belong to the model object, so a reloaded or evicted
+  model never serves stale responses and its cache is freed with it.
+- ``CacheWarmer`` replays the hottest keys for a freshly loaded model in a
+  background thread until it runs out of keys or time budget, and exposes
+  progress for /health.
+
+Only the top-K keys are stored in plain text; the sketch itself holds
+hashed counts.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SKETCH_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Query frequency sketch
+# ---------------------------------------------------------------------------
+class QuerySketch:
+    """Count-min sketch of request keys plus a top-K table of the hottest."""
+
+    def __init__(self, width: int = 2048, depth: int = 4, top_k: int = 200) -> None:
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.dirty = False
+        self._rows = np.arange(depth)
+        self._top: dict[str, int] = {}
+        self._floor = 0          # ≤ smallest count in _top (refreshed lazily)
+        self._lock = threading.Lock()
+
+    def _columns(self, key: str) -> np.ndarray:
+        # Stable across processes (unlike hash()), so saved sketches stay valid.
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype="<u4") % self.width
+
+    # ------------------------------------------------------------------
+    def add(self, key: str, count: int = 1) -> int:
+        """Record `count` occurrences of `key`; returns its new estimate."""
+        cols = self._columns(key)
+        with self._lock:
+            cells = self.table[self._rows, cols]
+            estimate = int(cells.min()) + count
+            # Conservative update: raise only the cells below the new estimate.
+            self.table[self._rows, cols] = np.maximum(cells, estimate)
+            self.total += count
+            self.dirty = True
+            self._offer(key, estimate)
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        with self._lock:
+            return int(self.table[self._rows, self._columns(key)].min())
+
+    def top(self, n: Optional[int] = None) -> list[tuple[str, int]]:
+        """Hottest keys with their estimated counts, most frequent first."""
+        with self._lock:
+            ranked = sorted(self._top.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[:n]
+
+    def _offer(self, key: str, estimate: int) -> None:
+        top = self._top
+        if key in top or len(top) < self.top_k:
+            top[key] = estimate
+            return
+        if estimate <= self._floor:
+            return
+        victim = min(top, key=top.__getitem__)
+        if estimate > top[victim]:
+            del top[victim]
+            top[key] = estimate
+            victim = min(top, key=top.__getitem__)
+        self._floor = top[victim]
+
+    # ------------------------------------------------------------------
+    def save(self, path: str) -> None:
+        """Atomically write the sketch as JSON (table zlib-compressed)."""
+        with self._lock:
+            payload = {
+                "version": _SKETCH_VERSION,
+                "width": self.width,
+                "depth": self.depth,
+                "total": self.total,
+                "table": base64.b64encode(zlib.compress(self.table.tobytes())).decode("ascii"),
+                "top": sorted(self._top.items(), key=lambda kv: -kv[1]),
+            }
+            self.dirty = False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    def load(self, path: str) -> None:
+        """Replace the counts with those saved at `path`; no-op if missing or incompatible."""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+            if (payload["version"], payload["width"], payload["depth"]) != (
+                _SKETCH_VERSION, self.width, self.depth,
+            ):
+                logger.warning("Query sketch at %s has a different shape — starting fresh.", path)
+                return
+            raw = zlib.decompress(base64.b64decode(payload["table"]))
+            table = np.frombuffer(raw, dtype=np.int64).reshape(self.depth, self.width).copy()
+            top = [(str(key), int(count)) for key, count in payload["top"]]
+            total = int(payload["total"])
+        except (OSError, ValueError, KeyError, TypeError, zlib.error) as exc:
+            logger.warning("Could not read query sketch at %s (%s) — starting fresh.", path, exc)
+            return
+        with self._lock:
+            self.table = table
+            self.total = total
+            self._top = {}
+            self._floor = 0
+            for key, count in top:
+                self._offer(key, count)
+            self.dirty = False
+        logger.info("Loaded query sketch from %s (%d requests, %d hot keys)", path, total, len(self._top))
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+class ResponseCache:
+    """Per-model LRU of finished responses, keyed by canonical request key."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._by_model: weakref.WeakKeyDictionary[Any, OrderedDict[str, Any]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ml_model: Any, key: str) -> Optional[Any]:
+        with self._lock:
+            entries = self._by_model.get(ml_model)
+            value = entries.get(key) if entries is not None else None
+            if value is None:
+                self.misses += 1
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, ml_model: Any, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            entries = self._by_model.setdefault(ml_model, OrderedDict())
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+
+# ---------------------------------------------------------------------------
+# Background warmup
+# ---------------------------------------------------------------------------
+@dataclass
+class WarmupProgress:
+    dataset: str
+    state: str = "pending"          # pending | running | done
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    elapsed_ms: float = 0.0
+    budget_ms: float = 0.0
+    stopped_by_budget: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class CacheWarmer:
+    """Runs one budgeted warmup per (re)loaded dataset on a daemon thread."""
+
+    def __init__(self, budget_seconds: float) -> None:
+        self.budget_seconds = budget_seconds
+        self._progress: dict[str, WarmupProgress] = {}
+        self._threads: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def start(self, dataset: str, keys: Iterable[str], warm_one: Callable[[str], None]) -> WarmupProgress:
+        """Warm `keys` (hottest first) with `warm_one` in the background."""
+        keys = list(keys)
+        progress = WarmupProgress(dataset, total=len(keys), budget_ms=self.budget_seconds * 1e3)
+        thread = threading.Thread(
+            target=self._run, args=(progress, keys, warm_one),
+            name=f"cache-warmup-{dataset}", daemon=True,
+        )
+        with self._lock:
+            self._progress[dataset] = progress
+            self._threads[dataset] = thread
+        thread.start()
+        return progress
+
+    def wait(self, dataset: str, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            thread = self._threads.get(dataset)
+        if thread is not None:
+            thread.join(timeout)
+
+    def progress(self, dataset: str) -> Optional[WarmupProgress]:
+        with self._lock:
+            return self._progress.get(dataset)
+
+    def _run(self, progress: WarmupProgress, keys: list[str], warm_one: Callable[[str], None]) -> None:
+        start = time.perf_counter()
+        progress.state = "running"
+        for key in keys:
+            if time.perf_counter() - start >= self.budget_seconds:
+                progress.stopped_by_budget = True
+                break
+            try:
+                warm_one(key)
+                progress.completed += 1
+            except Exception:   # a bad key must not stop the warmup
+                progress.failed += 1
+                logger.debug("Warmup key failed: %s", key, exc_info=True)
+            progress.elapsed_ms = round((time.perf_counter() - start) * 1e3, 1)
+        progress.elapsed_ms = round((time.perf_counter() - start) * 1e3, 1)
+        progress.state = "done"
+        logger.info("Cache warmup for %r: %d/%d queries in %.0f ms%s",
+                    progress.dataset, progress.completed, progress.total, progress.elapsed_ms,
+                    " (time budget reached)" if progress.stopped_by_budget else "")
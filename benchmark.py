@@ -0,0 +1,403 @@
+"""
+benchmark.py
+------------
+Memory / latency report for the ML model's storage modes.
+Run from repo root:  python benchmark.py [n_synthetic_roles]
+
+Reports, in order:
+
+- sparse vs dense vs seniority-family (variant) scoring, and float64 vs
+  compact (float32 + packed vocabulary), on the shipped catalog and on a
+  synthetic large one
+- /recommend payload size and latency, full vs sparse `fields`
+- resume skill-extraction throughput on large documents
+- time to first result, /recommend/stream vs /recommend
+- batched what-if uplift vs per-candidate scoring
+- the fast query encoder: fuzzed for exact equality with
+  vectorizer.transform, then latency
+- query-sketch recall, and post-reload latency with a cold vs a
+  sketch-warmed response cache
+- top-k latency of sharded scoring as the shard count grows (run with a
+  large n_synthetic_roles)
+"""
+
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Keep benchmark traffic out of the service's query sketch, and measure
+# uncached /recommend unless a report enables the response cache itself.
+os.environ.setdefault("QUERY_SKETCH_PATH", os.path.join(tempfile.gettempdir(), "benchmark_query_sketch.json"))
+os.environ.setdefault("RESPONSE_CACHE_SIZE", "0")
+
+import pandas as pd
+
+from backend.ml.model import MLModel, _BASE_ROWS
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "backend", "data", "job_roles.csv")
+
+QUERIES = [
+    "python, sql, pandas, machine learning",
+    "react, javascript, css, html",
+    "docker, kubernetes, aws, terraform",
+    "excel, communication, stakeholder management",
+    "origami, pottery, clay sculpting",
+]
+
+
+def synthetic_catalog(n_roles: int, seed: int = 0) -> str:
+    """Write an n_roles catalog built from the base skills plus random jargon; return its path."""
+    rng = random.Random(seed)
+    base_skills = sorted({s.strip() for _, skills, _ in _BASE_ROWS for s in skills.split(",")})
+    jargon = [f"tool{i}" for i in range(max(200, n_roles // 4))]
+    rows = []
+    for i in range(n_roles):
+        picked = rng.sample(base_skills, 8) + rng.sample(jargon, 4)
+        rows.append((f"Role {i}", ", ".join(picked), rng.randint(400_000, 3_000_000)))
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    pd.DataFrame(rows, columns=["role", "skills", "avg_salary"]).to_csv(path, index=False)
+    return path
+
+
+def time_queries(ml_model: MLModel, repeats: int = 200) -> float:
+    """Mean similarity_scores() latency in microseconds."""
+    for q in QUERIES:
+        ml_model.similarity_scores(q)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for q in QUERIES:
+            ml_model.similarity_scores(q)
+    return (time.perf_counter() - start) / (repeats * len(QUERIES)) * 1e6
+
+
+def report(label: str, csv_path: str, repeats: int) -> None:
+    print(f"\n{'=' * 78}")
+    print(f"Catalog: {label}")
+    print("-" * 78)
+    print(f"  {'mode':<18} {'matrix KB':>10} {'idf KB':>8} {'vocab KB':>9} {'total KB':>9} {'latency µs':>11}")
+    for compact in (False, True):
+        for layout in ("sparse", "dense", "variants"):
+            m = MLModel()
+            if layout == "variants":
+                m.load(csv_path, compact=compact, variant_scoring=True)
+                if m.variants is None:
+                    continue            # no seniority families in this catalog
+            else:
+                m.load(csv_path, compact=compact, layout=layout)
+            mem = m.memory_report()
+            mode = f"{layout}{' compact' if compact else ''}"
+            print(f"  {mode:<18} {mem['matrix'] / 1024:>10.1f} {mem['idf'] / 1024:>8.1f} "
+                  f"{mem['vocabulary'] / 1024:>9.1f} {mem['total'] / 1024:>9.1f} "
+                  f"{time_queries(m, repeats):>11.1f}")
+            rows, cols = m.X.shape
+    print(f"  shape: {rows} rows × {cols} terms = {rows * cols:,} cells")
+
+
+def report_fieldsets(repeats: int = 50) -> None:
+    """POST /recommend through the ASGI app with and without a `fields` selection."""
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    fieldsets = {
+        "full (default)": None,
+        "role/score/salary": ["match_score", "avg_salary"],
+    }
+    print(f"\n{'=' * 78}")
+    print("Endpoint: POST /recommend  (top_n=10)")
+    print("-" * 78)
+    print(f"  {'fieldset':<22} {'bytes':>8} {'latency ms':>11}")
+    with TestClient(app) as client:
+        for label, fields in fieldsets.items():
+            bodies = [{"skills": q, "top_n": 10, "fields": fields} for q in QUERIES]
+            size = sum(len(client.post("/recommend", json=b).content) for b in bodies) / len(bodies)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for b in bodies:
+                    client.post("/recommend", json=b)
+            elapsed = (time.perf_counter() - start) / (repeats * len(bodies)) * 1e3
+            print(f"  {label:<22} {size:>8.0f} {elapsed:>11.2f}")
+
+
+def report_resume_extraction(sizes_mb=(1, 10, 50), chunk_bytes: int = 64 * 1024) -> None:
+    """Chunked skill-extraction throughput over synthetic resumes of growing size."""
+    m = MLModel()
+    m.load(CSV_PATH)
+    rng = random.Random(0)
+    words = ["experience", "team", "built", "delivered", "the", "and", "with", "project",
+             "machine", "learning", "python", "react", "docker", "sql", "data", "cloud"]
+    paragraph = " ".join(rng.choice(words) for _ in range(10_000)).encode() + b".\n"
+
+    print(f"\n{'=' * 78}")
+    print(f"Resume extraction  ({len(m.skill_automaton)} patterns, {chunk_bytes // 1024} KB chunks)")
+    print("-" * 78)
+    print(f"  {'document':<10} {'seconds':>9} {'MB/s':>8} {'skills':>7}")
+    for size_mb in sizes_mb:
+        total = size_mb * 1024 * 1024
+        scanner = m.skill_automaton.scanner()
+        start = time.perf_counter()
+        fed = 0
+        while fed < total:
+            scanner.feed(paragraph[:chunk_bytes])
+            fed += min(chunk_bytes, len(paragraph))
+        found = scanner.skills()
+        elapsed = time.perf_counter() - start
+        print(f"  {size_mb:>7} MB {elapsed:>9.2f} {size_mb / elapsed:>8.1f} {len(found):>7}")
+
+
+def report_time_to_first_result(repeats: int = 200) -> None:
+    """
+    Server-side time until the first byte can be written: the full
+    /recommend handler vs the first `ranking` event of /recommend/stream.
+    """
+    from backend.main import _rank_roles, _stream_events, recommend_careers
+    from backend.schemas import RecommendRequest
+
+    m = MLModel()
+    m.load(CSV_PATH)
+    requests = [RecommendRequest(skills=q, top_n=10) for q in QUERIES]
+
+    def mean_ms(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for req in requests:
+                fn(req)
+        return (time.perf_counter() - start) / (repeats * len(requests)) * 1e3
+
+    full = mean_ms(lambda req: recommend_careers(req, m))
+    first = mean_ms(lambda req: next(_stream_events(req, _rank_roles(req, m), m, sse=False)))
+    print(f"\n{'=' * 78}")
+    print("Time to first result  (top_n=10, in-process)")
+    print("-" * 78)
+    print(f"  /recommend         full response       {full:>8.2f} ms")
+    print(f"  /recommend/stream  first (ranking)     {first:>8.2f} ms")
+
+
+def fuzz_queries(vocab_terms, n: int, seed: int = 0) -> list[str]:
+    """Skill-list-like strings mixing vocabulary words, stop words, symbols and non-ASCII."""
+    rng = random.Random(seed)
+    words = list(vocab_terms) + [
+        "the", "and", "of", "a", "i", "c++", "c#", "ci/cd", "ui/ux", "node.js", "Café",
+        "naïve", "İstanbul", "\u212a", "ß", "x_y", "ab_cd", "", " ", "\t", "1", "42", "Python3",
+    ]
+    separators = [", ", ",", " ", ";", "/", " , ", ",,", "\n", " - ", "|"]
+    texts = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(0, 14)):
+            r = rng.random()
+            if r < 0.7:
+                word = rng.choice(words)
+            elif r < 0.85:
+                word = "".join(rng.choice(string.printable) for _ in range(rng.randint(1, 8)))
+            else:
+                word = "".join(chr(rng.randint(32, 0x2FFF)) for _ in range(rng.randint(1, 6)))
+            parts += [word.upper() if rng.random() < 0.2 else word, rng.choice(separators)]
+        texts.append("".join(parts))
+    return texts
+
+
+def report_query_encoder(n_fuzz: int = 20_000, repeats: int = 500) -> None:
+    """
+    QueryEncoder vs vectorizer.transform: exact-equality fuzz (float64 and
+    compact float32), then per-query latency.
+    """
+    from backend.ml.encoder import clean_query
+
+    print(f"\n{'=' * 78}")
+    print("Query encoder vs vectorizer.transform")
+    print("-" * 78)
+    encoder_us_by_mode = {}
+    for compact in (False, True):
+        m = MLModel()
+        m.load(CSV_PATH, compact=compact)
+        for text in fuzz_queries([t for t in m.vectorizer.vocabulary_ if " " not in t], n_fuzz):
+            ref = m.vectorizer.transform([clean_query(text)])
+            ref.sort_indices()
+            got = m.encoder.transform(text)
+            assert got.dtype == ref.dtype and got.shape == ref.shape, text
+            assert (got.indices == ref.indices).all() and (got.data == ref.data).all(), text
+
+        def mean_us(fn) -> float:
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for q in QUERIES:
+                    fn(q)
+            return (time.perf_counter() - start) / (repeats * len(QUERIES)) * 1e6
+
+        sklearn_us = mean_us(lambda q: m.vectorizer.transform([clean_query(q)]))
+        encoder_us = mean_us(m.encoder.transform)
+        label = "compact" if compact else "float64"
+        print(f"  {label:<8} {n_fuzz} fuzzed queries identical   "
+              f"sklearn {sklearn_us:>7.1f} µs   encoder {encoder_us:>6.1f} µs")
+        encoder_us_by_mode[label] = encoder_us
+    # CompactVocabulary lookups are a pure-Python binary search over the
+    # packed terms, so compact mode trades per-query time for memory.
+    print(f"  compact vocabulary lookups: encoder "
+          f"{encoder_us_by_mode['compact'] / encoder_us_by_mode['float64']:.1f}× slower than float64")
+
+
+def report_what_if(repeats: int = 200) -> None:
+    """Batched what-if uplift vs one full scoring pass per candidate skill."""
+    from backend.ml.logic import get_strengths_and_missing, skill_uplift_scores
+
+    m = MLModel()
+    m.load(CSV_PATH)
+    skills = "python, sql"
+    row = m.role_index["data scientist"]
+    role_skills = [s.strip() for s in str(m.df["skills"].iat[row]).lower().split(",")]
+    _, missing = get_strengths_and_missing(["python", "sql"], role_skills)
+
+    def mean_ms(fn) -> float:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        return (time.perf_counter() - start) / repeats * 1e3
+
+    batched = mean_ms(lambda: skill_uplift_scores(skills, m, row, missing))
+    looped = mean_ms(lambda: [m.similarity_scores(f"{skills}, {s}")[row] for s in [""] + missing])
+    print(f"\n{'=' * 78}")
+    print(f"What-if uplift  (Data Scientist, {len(missing)} missing skills)")
+    print("-" * 78)
+    print(f"  one scoring pass per candidate     {looped:>8.3f} ms")
+    print(f"  one sparse batch vs the role row   {batched:>8.3f} ms")
+
+
+def report_cache_warmup(n_distinct: int = 2000, n_requests: int = 50_000, window: int = 2000) -> None:
+    """
+    Zipf-like request log → count-min / top-K sketch recall, then latency
+    after a reload with a cold vs a warmed cache.  Only the first request for
+    each distinct query in the next `window` requests is timed — repeats
+    would be hits in either run and hide what the warmup adds.
+    """
+    from collections import Counter
+
+    from backend import main
+    from backend.schemas import RecommendRequest
+    from backend.warmup import CacheWarmer, QuerySketch, ResponseCache
+
+    rng = random.Random(0)
+    base_skills = sorted({s.strip() for _, skills, _ in _BASE_ROWS for s in skills.split(",")})
+    pool = [", ".join(rng.sample(base_skills, rng.randint(2, 6))) for _ in range(n_distinct)]
+    weights = [1.0 / (i + 1) for i in range(n_distinct)]
+    requests = [RecommendRequest(skills=q, top_n=5) for q in pool]
+    keys = [main._query_key(r, None) for r in requests]
+
+    sketch = QuerySketch(top_k=200)
+    exact: Counter = Counter()
+    for i in rng.choices(range(n_distinct), weights, k=n_requests):
+        sketch.add(keys[i])
+        exact[keys[i]] += 1
+    true_top = {k for k, _ in exact.most_common(200)}
+    recall = len(true_top & {k for k, _ in sketch.top()}) / len(true_top)
+
+    m = MLModel()
+    m.load(CSV_PATH)
+    replay = list(dict.fromkeys(rng.choices(range(n_distinct), weights, k=window)))
+
+    def replay_latencies() -> list[float]:
+        out = []
+        for i in replay:
+            start = time.perf_counter()
+            main.recommend_careers(requests[i], m)
+            out.append((time.perf_counter() - start) * 1e3)
+        return sorted(out)
+
+    saved = main.response_cache, main.query_sketch
+    main.query_sketch = QuerySketch()
+    try:
+        main.response_cache = ResponseCache(1024)
+        cold = replay_latencies()
+
+        main.response_cache = ResponseCache(1024)
+        warmer = CacheWarmer(budget_seconds=10.0)
+        progress = warmer.start("benchmark", [k for k, _ in sketch.top()], lambda k: main._warm_one(m, k))
+        warmer.wait("benchmark")
+        hits_before = main.response_cache.hits
+        warm = replay_latencies()
+        hit_rate = (main.response_cache.hits - hits_before) / len(replay)
+    finally:
+        main.response_cache, main.query_sketch = saved
+
+    def pct(lat: list[float], p: float) -> float:
+        return lat[min(len(lat) - 1, int(p * len(lat)))]
+
+    print(f"\n{'=' * 78}")
+    print(f"Cache warmup  ({n_requests} logged requests over {n_distinct} distinct queries, "
+          f"sketch {sketch.depth}×{sketch.width})")
+    print("-" * 78)
+    print(f"  top-200 recall of the sketch        {recall:>7.1%}")
+    print(f"  warmup: {progress.completed} responses in {progress.elapsed_ms:.0f} ms")
+    print(f"  first request per query after reload ({len(replay)} distinct of the next {window})")
+    print(f"  {'':<36} mean ms   p50 ms    p99 ms")
+    for label, lat in (("cold cache", cold), (f"warmed cache ({hit_rate:.0%} hits)", warm)):
+        print(f"    {label:<32} {sum(lat) / len(lat):>8.3f} {pct(lat, .5):>8.3f}  {pct(lat, .99):>8.3f}")
+
+
+def report_sharded_scaling(n_roles: int, shard_counts=(1, 2, 4, 8), k: int = 10, repeats: int = 20) -> None:
+    """
+    top_k() latency unsharded vs row-sharded on threads / processes.
+    Speed-up is bounded by the number of cores (os.cpu_count()).
+    """
+    path = synthetic_catalog(n_roles)
+    print(f"\n{'=' * 78}")
+    print(f"Sharded scoring  ({n_roles} roles, top-{k}, {os.cpu_count()} cores)")
+    print("-" * 78)
+    try:
+        base = MLModel()
+        base.load(path)
+
+        def mean_ms(m: MLModel) -> float:
+            for q in QUERIES:
+                m.top_k(q, k)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for q in QUERIES:
+                    m.top_k(q, k)
+            return (time.perf_counter() - start) / (repeats * len(QUERIES)) * 1e3
+
+        serial = mean_ms(base)
+        print(f"  {'unsharded':<22}{serial:>10.2f} ms")
+        for executor in ("thread", "process"):
+            for n in shard_counts:
+                m = MLModel()
+                m.load(path, shards=n, shard_executor=executor)
+                try:
+                    for q in QUERIES:
+                        assert [list(a) for a in m.top_k(q, k)] == [list(a) for a in base.top_k(q, k)]
+                    ms = mean_ms(m)
+                finally:
+                    m.close()
+                print(f"  {executor + ' x' + str(n):<22}{ms:>10.2f} ms   speed-up {serial / ms:>5.2f}x")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    n_synthetic = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    report("shipped job_roles.csv", CSV_PATH, repeats=200)
+
+    synth = synthetic_catalog(n_synthetic)
+    try:
+        report(f"synthetic ({n_synthetic} roles)", synth, repeats=20)
+    finally:
+        os.remove(synth)
+
+    report_fieldsets()
+    report_resume_extraction()
+    report_time_to_first_result()
+    report_what_if()
+    report_query_encoder()
+    report_cache_warmup()
+    report_sharded_scaling(max(n_synthetic, 50_000))
+
+    print(f"\n{'=' * 78}")
+    print("Done.")
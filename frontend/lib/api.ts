@@ -1,12 +1,119 @@
 import axios from "axios";
-import type { RecommendRequest, RecommendResponse, HealthResponse } from "./types";
+import type {
+  RecommendRequest,
+  RecommendResponse,
+  HealthResponse,
+  PartialRoleRecommendation,
+  RecommendStreamEvent,
+  SessionResponse,
+  SimilarRolesResponse,
+  SkillSuggestResponse,
+  WhatIfResponse,
+} from "./types";
 
 const BASE = process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000";
 
 const client = axios.create({ baseURL: BASE, timeout: 15_000 });
 
-export async function fetchRecommendations(req: RecommendRequest): Promise<RecommendResponse> {
-  const { data } = await client.post<RecommendResponse>("/recommend", req);
+/** Full recommendations, or only the selected per-role fields when `fields` is sent. */
+export function fetchRecommendations(
+  req: RecommendRequest & { fields?: undefined },
+): Promise<RecommendResponse>;
+export function fetchRecommendations(
+  req: RecommendRequest,
+): Promise<RecommendResponse<PartialRoleRecommendation>>;
+export async function fetchRecommendations(
+  req: RecommendRequest,
+): Promise<RecommendResponse<PartialRoleRecommendation>> {
+  const { data } = await client.post<RecommendResponse<PartialRoleRecommendation>>("/recommend", req);
+  return data;
+}
+
+/**
+ * Progressive variant of fetchRecommendations: `onEvent` fires with the
+ * ranked roles first, then once per role as its details are computed.
+ */
+export async function streamRecommendations(
+  req: RecommendRequest,
+  onEvent: (event: RecommendStreamEvent) => void,
+): Promise<void> {
+  const res = await fetch(`${BASE}/recommend/stream`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "application/x-ndjson" },
+    body: JSON.stringify(req),
+  });
+  if (!res.ok || !res.body) {
+    const detail = await res.json().catch(() => null);
+    throw new Error(detail?.detail ?? `Request failed (${res.status})`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    buffer += decoder.decode(value, { stream: !done });
+    const lines = buffer.split("\n");
+    buffer = lines.pop() ?? "";
+    for (const line of lines) {
+      if (line.trim()) onEvent(JSON.parse(line) as RecommendStreamEvent);
+    }
+    if (done) break;
+  }
+  if (buffer.trim()) onEvent(JSON.parse(buffer) as RecommendStreamEvent);
+}
+
+export async function fetchResumeRecommendations(
+  file: File,
+  topN = 3,
+): Promise<RecommendResponse> {
+  const form = new FormData();
+  form.append("file", file);
+  form.append("top_n", String(topN));
+  const { data } = await client.post<RecommendResponse>("/recommend/resume", form);
+  return data;
+}
+
+/** Missing skills of `role`, ranked by how much each would raise the match score. */
+export async function fetchSkillUplift(
+  skills: string,
+  role: string,
+  limit?: number,
+): Promise<WhatIfResponse> {
+  const { data } = await client.post<WhatIfResponse>("/recommend/what-if", { skills, role, limit });
+  return data;
+}
+
+export async function fetchSimilarRoles(role: string, k = 5): Promise<SimilarRolesResponse> {
+  const { data } = await client.get<SimilarRolesResponse>(
+    `/roles/${encodeURIComponent(role)}/similar`,
+    { params: { k } },
+  );
+  return data;
+}
+
+export async function fetchSkillSuggestions(prefix: string, limit = 8): Promise<string[]> {
+  const { data } = await client.get<SkillSuggestResponse>("/skills/suggest", {
+    params: { prefix, limit },
+  });
+  return data.suggestions;
+}
+
+/** Start a server-side session; edit it with updateSessionSkills(). */
+export async function createSession(skills: string[], topN = 3): Promise<SessionResponse> {
+  const { data } = await client.post<SessionResponse>("/sessions", { skills, top_n: topN });
+  return data;
+}
+
+export async function updateSessionSkills(
+  sessionId: string,
+  change: { add?: string[]; remove?: string[] },
+  topN = 3,
+): Promise<SessionResponse> {
+  const { data } = await client.patch<SessionResponse>(
+    `/sessions/${encodeURIComponent(sessionId)}`,
+    { add: change.add ?? [], remove: change.remove ?? [], top_n: topN },
+  );
   return data;
 }
 
@@ -11,23 +11,118 @@ export interface RoleRecommendation {
   mini_projects: string[];
   headline: string;
   low_confidence: boolean;
+  similar_roles?: string[];
 }
 
-export interface RecommendResponse {
-  recommendations: RoleRecommendation[];
+/**
+ * A recommendation from a request with a sparse `fields` selection: only
+ * `role` is guaranteed, every other field is present only when selected.
+ */
+export type PartialRoleRecommendation = Pick<RoleRecommendation, "role"> &
+  Partial<Omit<RoleRecommendation, "role">>;
+
+/** `R` is PartialRoleRecommendation for requests that send `fields`. */
+export interface RecommendResponse<R = RoleRecommendation> {
+  recommendations: R[];
   total_results: number;
   input_skills: string;
   no_strong_match: boolean;
   suggestion: string | null;
 }
 
+export type RoleField =
+  | "match_score"
+  | "avg_salary"
+  | "strengths"
+  | "missing_skills"
+  | "resources"
+  | "action_plan"
+  | "mini_projects"
+  | "headline"
+  | "low_confidence"
+  | "similar_roles";
+
 export interface RecommendRequest {
   skills: string;
   top_n: number;
+  /** Sparse fieldset — omit for the full response. */
+  fields?: RoleField[];
+  /** Keep only the best Junior / Senior variant of each role. */
+  collapse_variants?: boolean;
 }
 
 export interface HealthResponse {
   status: string;
   model_ready: boolean;
   dataset_rows: number | null;
+  warmup?: WarmupStatus;
+}
+
+export interface WarmupStatus {
+  state: "pending" | "running" | "done";
+  total: number;
+  completed: number;
+  failed: number;
+  elapsed_ms: number;
+  budget_ms: number;
+  stopped_by_budget: boolean;
+}
+
+export interface SimilarRole {
+  role: string;
+  similarity: number;
+}
+
+export interface SimilarRolesResponse {
+  role: string;
+  similar: SimilarRole[];
+}
+
+export interface SkillSuggestResponse {
+  prefix: string;
+  suggestions: string[];
+}
+
+// Events from POST /recommend/stream (NDJSON, one object per line)
+export interface RankedRole {
+  role: string;
+  match_score: number;
+  avg_salary: number;
+  low_confidence: boolean;
+}
+
+export type RecommendStreamEvent =
+  | {
+      event: "ranking";
+      roles: RankedRole[];
+      total_results: number;
+      input_skills: string;
+      no_strong_match: boolean;
+      suggestion: string | null;
+    }
+  | { event: "role"; index: number; recommendation: PartialRoleRecommendation }
+  | { event: "done" }
+  | { event: "error"; index: number; detail: string };
+
+// POST /recommend/what-if
+export interface SkillUplift {
+  skill: string;
+  match_score: number;
+  uplift: number;
+}
+
+export interface WhatIfResponse {
+  role: string;
+  current_score: number;
+  candidates: SkillUplift[];
+}
+
+// POST /sessions, PATCH / GET /sessions/{session_id}
+export interface SessionResponse {
+  session_id: string;
+  dataset: string;
+  skills: string[];
+  recommendations: RankedRole[];
+  no_strong_match: boolean;
+  expires_in_seconds: number;
 }
@@ -0,0 +1,43 @@
+"""
+Shared fixtures.  Run from the repo root:  python -m pytest -q
+
+The environment is set before `backend` is imported so the app never
+touches the service's own query sketch or span log.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_STATE_DIR = tempfile.mkdtemp(prefix="career-tests-")
+os.environ.setdefault("QUERY_SKETCH_PATH", os.path.join(_STATE_DIR, "query_sketch.json"))
+os.environ.setdefault("TRACING_ENABLED", "false")
+
+import pytest
+
+from backend.config import settings
+from backend.ml.model import MLModel
+
+
+@pytest.fixture(scope="session")
+def csv_path() -> str:
+    return settings.csv_path
+
+
+@pytest.fixture(scope="session")
+def ml_model(csv_path) -> MLModel:
+    m = MLModel()
+    m.load(csv_path)
+    return m
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    with TestClient(app) as c:
+        yield c
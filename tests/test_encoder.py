@@ -0,0 +1,80 @@
+"""QueryEncoder must reproduce vectorizer.transform bit for bit."""
+
+import random
+
+import pytest
+
+from backend.ml.encoder import QueryEncoder, clean_query
+from backend.ml.model import MLModel
+
+EDGE_CASES = [
+    "",
+    "   ",
+    "the and of",                           # stop words only
+    "python",
+    "Python, SQL, Pandas",
+    "machine learning, machine learning",   # repeated bigram
+    "C++, C#, CI/CD, node.js",
+    "naïve résumé — Ünïcödé",
+    "x, y, z, 1, 22",
+    "python" * 50,
+]
+
+
+def _fuzz(words: list[str], n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    separators = [", ", ",", " ", " / ", "; ", " - ", "\n", ",,  "]
+    out = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            word = rng.choice(words)
+            parts += [word.upper() if rng.random() < 0.2 else word, rng.choice(separators)]
+        out.append("".join(parts))
+    return out
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["float64", "compact"])
+def model(request, csv_path) -> MLModel:
+    m = MLModel()
+    m.load(csv_path, compact=request.param)
+    return m
+
+
+def _assert_same(model: MLModel, text: str) -> None:
+    ref = model.vectorizer.transform([clean_query(text)])
+    ref.sort_indices()
+    got = model.encoder.transform(text)
+    assert got.shape == ref.shape and got.dtype == ref.dtype
+    assert got.indices.tolist() == ref.indices.tolist(), text
+    assert got.data.tolist() == ref.data.tolist(), text      # exact, not approx
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_edge_cases_match_vectorizer(model, text):
+    _assert_same(model, text)
+
+
+def test_fuzzed_queries_match_vectorizer(model):
+    words = [t for t in model.vectorizer.vocabulary_ if " " not in t] + ["the", "and", "zzz", "c++"]
+    for text in _fuzz(words, 2000):
+        _assert_same(model, text)
+
+
+def test_transform_many_stacks_single_rows(model):
+    texts = ["python, sql", "", "react, css, html", "origami"]
+    batch = model.encoder.transform_many(texts)
+    assert batch.shape == (len(texts), model.encoder.n_features)
+    for i, text in enumerate(texts):
+        row = batch[i]
+        single = model.encoder.transform(text)
+        assert row.indices.tolist() == single.indices.tolist()
+        assert row.data.tolist() == single.data.tolist()
+
+
+def test_rejects_unsupported_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(sublinear_tf=True).fit(["python sql", "react css"])
+    with pytest.raises(ValueError):
+        QueryEncoder(vectorizer)
@@ -0,0 +1,46 @@
+"""Single-pass skill extraction: tokenisation and chunked scanning."""
+
+import random
+
+from backend.ml.extract import SkillAutomaton
+
+RESUME = (
+    "Senior engineer — Python, SQL and machine learning.\n"
+    "Built CI/CD pipelines with Docker; some C++ and C#.  Café tooling, "
+    "javascript (not java), " + "x" * 300 + " data analysis, Excel.\n"
+    "Communication: ★★★★☆  Grade: C.  Machine\nlearning again; python.\n"
+)
+
+
+def test_symbol_skills_stay_distinct():
+    ac = SkillAutomaton(["c", "c++", "c#", "ci", "cd", "ci/cd"])
+    assert ac.extract("C++, C#, CI/CD, Grade: C.") == ["c++", "c#", "ci/cd"]
+
+
+def test_lone_single_letters_and_slash_edges_are_not_patterns():
+    ac = SkillAutomaton(["r", "c", "/cd", "ci/", "objective c"])
+    assert ac.names == ["objective c"]
+    assert ac.extract("R and C, objective C") == ["objective c"]
+
+
+def test_whole_token_matching():
+    ac = SkillAutomaton(["java", "javascript", "machine learning", "learning"])
+    assert ac.extract("JavaScript only") == ["javascript"]
+    assert ac.extract("machine learning, learning") == ["machine learning"]
+
+
+def test_chunked_scan_matches_one_shot_extract(ml_model):
+    ac = ml_model.skill_automaton
+    expected = ac.extract(RESUME)
+    assert {"python", "sql", "machine learning", "docker"} <= set(expected)
+
+    data = RESUME.encode("utf-8")
+    rng = random.Random(0)
+    splits = [[i] for i in range(1, len(data))]            # every single boundary
+    splits += [sorted(rng.sample(range(1, len(data)), 40)) for _ in range(50)]
+    for cuts in splits:
+        scan = ac.scanner()
+        for lo, hi in zip([0, *cuts], [*cuts, len(data)]):
+            scan.feed(data[lo:hi])
+        assert scan.skills() == expected, cuts
+        assert scan.bytes_scanned == len(data)
@@ -0,0 +1,137 @@
+"""DatasetRegistry: lazy loads, LRU eviction under a memory budget, pinning."""
+
+import shutil
+
+import pandas as pd
+import pytest
+
+from backend.ml.registry import DatasetRegistry, DatasetUnavailable
+
+
+@pytest.fixture
+def catalogs(tmp_path, csv_path) -> dict[str, str]:
+    """Three copies of the shipped catalog plus one with a different vocabulary."""
+    paths = {}
+    for name in ("default", "a", "b"):
+        paths[name] = str(tmp_path / f"{name}.csv")
+        shutil.copy(csv_path, paths[name])
+    df = pd.read_csv(csv_path).head(20)
+    df["skills"] = df["skills"] + ", cobol"
+    paths["other"] = str(tmp_path / "other.csv")
+    df.to_csv(paths["other"], index=False)
+    return paths
+
+
+def _footprints(paths: list[str]) -> list[int]:
+    """Registry footprint after loading each of `paths` in turn (no budget)."""
+    probe = DatasetRegistry(memory_budget_bytes=1 << 40)
+    sizes = []
+    for i, path in enumerate(paths):
+        probe.register(str(i), path)
+        probe.get(str(i))
+        sizes.append(probe.footprint_bytes())
+    return sizes
+
+
+def test_lazy_load_and_hits(catalogs):
+    loaded = []
+    registry = DatasetRegistry(1 << 40, on_load=lambda name, m: loaded.append((name, m)))
+    registry.register("a", catalogs["a"])
+    assert not registry.is_loaded("a")
+
+    model = registry.get("a")
+    assert registry.get("a") is model
+    assert registry.is_loaded("a") and registry.name_of(model) == "a"
+    assert loaded == [("a", model)]                       # hook runs on loads only
+    (stats,) = registry.stats()
+    assert stats["loads"] == 1 and stats["hits"] == 1
+
+
+def test_unregistered_dataset_is_key_error(catalogs):
+    with pytest.raises(KeyError):
+        DatasetRegistry(1 << 40).get("nope")
+
+
+def test_lru_eviction_keeps_pinned_and_requested(catalogs):
+    _, two, three = _footprints([catalogs["default"], catalogs["a"], catalogs["b"]])
+    registry = DatasetRegistry((two + three) // 2)        # room for two models
+    registry.register("default", catalogs["default"], pinned=True)
+    registry.register("a", catalogs["a"])
+    registry.register("b", catalogs["b"])
+
+    registry.get("default")
+    a = registry.get("a")
+    registry.get("default")                               # a is now least recently used
+    registry.get("b")
+    assert registry.is_loaded("default") and registry.is_loaded("b")
+    assert not registry.is_loaded("a") and registry.name_of(a) is None
+    assert {s["name"]: s["evictions"] for s in registry.stats()}["a"] == 1
+
+    # A reload builds a fresh model and counts as a second cold load.
+    assert registry.get("a") is not a
+    assert {s["name"]: s["loads"] for s in registry.stats()}["a"] == 2
+    assert registry.is_loaded("default")
+
+
+def test_requested_dataset_served_even_over_budget(catalogs):
+    registry = DatasetRegistry(memory_budget_bytes=1)
+    registry.register("default", catalogs["default"], pinned=True)
+    registry.register("a", catalogs["a"])
+    registry.get("default")
+    registry.get("a")
+    assert registry.is_loaded("default") and registry.is_loaded("a")
+    registry.register("b", catalogs["b"])
+    registry.get("b")
+    assert not registry.is_loaded("a") and registry.is_loaded("b")
+
+
+def test_identical_vocabularies_are_shared(catalogs):
+    registry = DatasetRegistry(1 << 40)
+    for name in ("a", "b", "other"):
+        registry.register(name, catalogs[name])
+    a, b, other = (registry.get(n) for n in ("a", "b", "other"))
+    assert a.vectorizer.vocabulary_ is b.vectorizer.vocabulary_
+    assert other.vectorizer.vocabulary_ is not a.vectorizer.vocabulary_
+    shared = {s["name"]: s["shared_vocabulary"] for s in registry.stats()}
+    assert shared == {"a": True, "b": True, "other": False}
+    # Pooled vocabularies are counted once.
+    assert registry.footprint_bytes() < sum(
+        m.memory_report()["total"] for m in (a, b, other)
+    )
+
+
+def test_missing_named_catalog_is_unavailable(tmp_path):
+    missing = tmp_path / "regional" / "us.csv"
+    registry = DatasetRegistry(1 << 40)
+    registry.register("us", str(missing))
+    with pytest.raises(DatasetUnavailable):
+        registry.get("us")
+    assert not missing.exists()                           # nothing generated in its place
+    assert not registry.is_loaded("us")
+
+
+def test_malformed_catalog_is_unavailable(tmp_path):
+    bad = tmp_path / "bad.csv"
+    bad.write_text("a,b\n1,2\n")
+    registry = DatasetRegistry(1 << 40)
+    registry.register("bad", str(bad))
+    with pytest.raises(DatasetUnavailable):
+        registry.get("bad")
+
+
+def test_default_catalog_falls_back_to_builtin(tmp_path):
+    path = tmp_path / "data" / "job_roles.csv"
+    registry = DatasetRegistry(1 << 40)
+    registry.register("default", str(path), pinned=True, builtin_fallback=True)
+    model = registry.get("default")
+    assert path.exists() and len(model.df) > 0
+
+
+def test_api_reports_unknown_and_unavailable_datasets(client, tmp_path):
+    from backend.main import registry
+
+    registry.register("broken", str(tmp_path / "missing.csv"))
+    unknown = client.post("/recommend?dataset=nope", json={"skills": "python, sql"})
+    assert unknown.status_code == 404
+    broken = client.post("/recommend?dataset=broken", json={"skills": "python, sql"})
+    assert broken.status_code == 503
@@ -0,0 +1,121 @@
+"""POST /recommend/resume: streaming multipart parsing and its error codes."""
+
+import anyio
+import pytest
+
+from backend.config import settings
+from backend.uploads import FORM_OVERHEAD_BYTES
+
+RESUME = b"Data analyst: Python, SQL, Excel, Tableau and statistics.\n"
+
+
+def _multipart(parts: list[tuple[str, bytes, str | None]], boundary: str = "resume-boundary") -> tuple[bytes, str]:
+    body = b""
+    for name, value, content_type in parts:
+        body += f"--{boundary}\r\n".encode()
+        if content_type is None:
+            body += f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+        else:
+            body += (
+                f'Content-Disposition: form-data; name="{name}"; filename="resume"\r\n'
+                f"Content-Type: {content_type}\r\n\r\n"
+            ).encode()
+        body += value + b"\r\n"
+    body += f"--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def _post(client, body, content_type, **kwargs):
+    return client.post("/recommend/resume", content=body, headers={"Content-Type": content_type}, **kwargs)
+
+
+def test_resume_matches_recommend(client):
+    body, ctype = _multipart([("file", RESUME, "text/plain"), ("top_n", b"4", None)])
+    res = _post(client, body, ctype)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["total_results"] == 4
+    assert {"python", "sql", "excel"} <= set(data["input_skills"].split(", "))
+
+    expected = client.post("/recommend", json={"skills": data["input_skills"], "top_n": 4}).json()
+    assert data["recommendations"] == expected["recommendations"]
+
+
+def test_oversized_content_length_is_rejected_up_front(client, monkeypatch):
+    monkeypatch.setattr(settings, "resume_max_bytes", 1024)
+    body, ctype = _multipart([("file", b"python " * 5000, "text/plain")])
+    assert _post(client, body, ctype).status_code == 413
+
+
+def test_oversized_chunked_body_is_rejected_midway(client, monkeypatch):
+    monkeypatch.setattr(settings, "resume_max_bytes", 1024)
+    head, ctype = _multipart([("file", b"", "text/plain")])
+    head = head[: head.index(b"\r\n--resume-boundary--")]
+    chunk = b"python, sql " * 100
+    n_chunks = 1000
+
+    # Drive the app directly so the test sees how much of a chunked body
+    # (no Content-Length) the handler pulls before giving up.
+    received, sent = [], []
+
+    async def receive():
+        if not received:
+            received.append(head)
+            return {"type": "http.request", "body": head, "more_body": True}
+        received.append(chunk)
+        return {"type": "http.request", "body": chunk, "more_body": len(received) <= n_chunks}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/recommend/resume", "raw_path": b"/recommend/resume",
+        "root_path": "", "query_string": b"", "server": ("testserver", 80), "client": ("testclient", 50000),
+        "headers": [(b"content-type", ctype.encode()), (b"transfer-encoding", b"chunked")],
+    }
+    anyio.run(client.app, scope, receive, send)
+
+    assert sent[0]["status"] == 413
+    assert len(received) * len(chunk) < 2 * (1024 + FORM_OVERHEAD_BYTES)
+    assert len(received) < n_chunks
+
+
+@pytest.mark.parametrize("content_type", ["application/pdf", "image/png"])
+def test_non_text_file_part_is_unsupported(client, content_type):
+    body, ctype = _multipart([("file", b"%PDF-1.7 python sql", content_type)])
+    assert _post(client, body, ctype).status_code == 415
+
+
+def test_non_multipart_request_is_unsupported(client):
+    assert _post(client, RESUME, "text/plain").status_code == 415
+    assert client.post("/recommend/resume", json={"file": "python, sql"}).status_code == 415
+
+
+def test_missing_file_part(client):
+    body, ctype = _multipart([("top_n", b"3", None)])
+    res = _post(client, body, ctype)
+    assert res.status_code == 422
+    assert "file" in res.json()["detail"]
+
+
+def test_no_recognised_skills(client):
+    body, ctype = _multipart([("file", b"Lorem ipsum dolor sit amet.", "text/plain")])
+    res = _post(client, body, ctype)
+    assert res.status_code == 422
+    assert "No recognisable skills" in res.json()["detail"]
+
+
+@pytest.mark.parametrize("top_n", [b"0", b"11", b"three"])
+def test_top_n_form_field_is_validated(client, top_n):
+    body, ctype = _multipart([("file", RESUME, "text/plain"), ("top_n", top_n, None)])
+    res = _post(client, body, ctype)
+    assert res.status_code == 422
+    assert res.json()["detail"][0]["loc"] == ["body", "top_n"]
+
+
+def test_malformed_multipart_body(client):
+    _, ctype = _multipart([])
+    assert _post(client, b"--resume-boundaryXX\r\n", ctype).status_code == 400
+    bad_header = b"--resume-boundary\r\nContent-Disposition form-data\r\n\r\n"
+    assert _post(client, bad_header, ctype).status_code == 400
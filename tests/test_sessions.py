@@ -0,0 +1,177 @@
+"""Scoring sessions: parity with full rescoring, TTL and memory-cap eviction."""
+
+import random
+import types
+
+import numpy as np
+import pytest
+
+from backend.ml import sessions as sessions_module
+from backend.ml.sessions import ScoringSession, SessionStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(sessions_module, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def _skill_pool(ml_model) -> list[str]:
+    return sorted({s.strip() for skills in ml_model.df["skills"] for s in str(skills).split(",")})
+
+
+def test_incremental_scores_match_full_rescore(ml_model):
+    rng = random.Random(0)
+    pool = _skill_pool(ml_model)
+    session = ScoringSession("s", "default", ml_model, max_chars=2000)
+    for _ in range(200):
+        if session.skills and rng.random() < 0.4:
+            session.update(remove=rng.sample(session.skills, rng.randint(1, min(3, len(session.skills)))))
+        else:
+            session.update(add=rng.sample(pool, rng.randint(1, 3)))
+        expected = (
+            ml_model.similarity_scores(", ".join(session.skills))
+            if session.skills else np.zeros(len(ml_model.df))
+        )
+        np.testing.assert_allclose(session.scores(), expected, rtol=0, atol=1e-12)
+
+
+def test_update_is_case_insensitive_and_ignores_duplicates(ml_model):
+    session = ScoringSession("s", "default", ml_model, max_chars=2000)
+    session.update(add=["Python", "SQL", "python", "  "])
+    assert session.skills == ["Python", "SQL"]
+    session.update(remove=["PYTHON"], add=["sql", "Docker"])
+    assert session.skills == ["SQL", "Docker"]
+
+
+def test_update_over_max_chars_leaves_session_unchanged(ml_model):
+    session = ScoringSession("s", "default", ml_model, max_chars=20)
+    session.update(add=["python", "sql"])
+    before = session.scores().copy()
+    with pytest.raises(ValueError):
+        session.update(add=["machine learning", "deep learning"])
+    assert session.skills == ["python", "sql"]
+    np.testing.assert_array_equal(session.scores(), before)
+
+
+def test_rebind_rescores_against_new_model(ml_model, csv_path):
+    from backend.ml.model import MLModel
+
+    session = ScoringSession("s", "default", ml_model, max_chars=2000)
+    session.update(add=["python", "sql", "pandas"])
+    other = MLModel()
+    other.load(csv_path, compact=True)
+    session.rebind(other)
+    np.testing.assert_allclose(session.scores(), other.similarity_scores("python, sql, pandas"), atol=1e-6)
+
+
+def test_sliding_ttl_expires_idle_sessions(ml_model, clock):
+    store = SessionStore(ttl_seconds=60, max_bytes=1 << 30, max_chars=2000)
+    idle = store.create("default", ml_model, ["python"])
+    active = store.create("default", ml_model, ["sql"])
+    clock.now += 40
+    store.get(active.session_id)            # refreshes the TTL
+    clock.now += 30
+    with pytest.raises(KeyError):
+        store.get(idle.session_id)
+    assert store.get(active.session_id) is active
+    assert store.expirations == 1
+    assert store.expires_in(active) == pytest.approx(60)
+
+
+def test_memory_cap_evicts_least_recently_used(ml_model, clock):
+    probe = SessionStore(ttl_seconds=60, max_bytes=1 << 30, max_chars=2000)
+    size = probe.create("default", ml_model, ["python"]).nbytes
+    store = SessionStore(ttl_seconds=60, max_bytes=int(size * 2.5), max_chars=2000)
+
+    first = store.create("default", ml_model, ["python"])
+    second = store.create("default", ml_model, ["sql"])
+    store.get(first.session_id)             # second is now least recently used
+    third = store.create("default", ml_model, ["docker"])
+
+    assert len(store) == 2 and store.evictions == 1
+    with pytest.raises(KeyError):
+        store.get(second.session_id)
+    assert store.get(first.session_id) is first
+    assert store.get(third.session_id) is third
+
+
+def test_cap_never_evicts_the_session_being_served(ml_model, clock):
+    store = SessionStore(ttl_seconds=60, max_bytes=1, max_chars=2000)
+    session = store.create("default", ml_model, ["python"])
+    assert store.get(session.session_id) is session
+
+
+# ── API ────────────────────────────────────────────────────────────────────
+def _ranking(recommendations) -> list[tuple[str, float]]:
+    return [(r["role"], r["match_score"]) for r in recommendations]
+
+
+def test_session_edits_match_recommend(client):
+    created = client.post("/sessions", json={"skills": ["python", "sql"], "top_n": 5})
+    assert created.status_code == 201
+    session_id = created.json()["session_id"]
+
+    edits = [
+        {"add": ["pandas", "machine learning"]},
+        {"remove": ["SQL"], "add": ["docker"]},
+        {"add": ["react", "css"], "remove": ["python"]},
+        {"remove": ["pandas", "machine learning", "docker", "react"]},
+        {"add": ["excel", "communication"]},
+    ]
+    for edit in edits:
+        res = client.patch(f"/sessions/{session_id}", json={**edit, "top_n": 5})
+        assert res.status_code == 200
+        body = res.json()
+        expected = client.post("/recommend", json={"skills": ", ".join(body["skills"]), "top_n": 5})
+        assert _ranking(body["recommendations"]) == _ranking(expected.json()["recommendations"])
+
+    assert client.get(f"/sessions/{session_id}").json()["skills"] == ["css", "excel", "communication"]
+    assert client.delete(f"/sessions/{session_id}").status_code == 204
+    assert client.get(f"/sessions/{session_id}").status_code == 404
+
+
+def test_session_validation_errors(client):
+    assert client.get("/sessions/does-not-exist").status_code == 404
+    too_long = client.post("/sessions", json={"skills": ["x" * 1500, "y" * 1500]})
+    assert too_long.status_code == 422
+
+
+def test_memory_total_tracks_every_change(ml_model, clock):
+    store = SessionStore(ttl_seconds=60, max_bytes=1 << 30, max_chars=2000)
+    live = [store.create("default", ml_model, ["python"]) for _ in range(5)]
+    live[0].update(add=["sql", "pandas", "machine learning"])
+    store.enforce_cap(live[0])
+    store.delete(live[1].session_id)
+    clock.now += 30
+    store.get(live[2].session_id)
+    clock.now += 40                          # all but live[2] expire
+    store.get(live[2].session_id)
+    assert store.memory_bytes() == live[2].nbytes
+    store.delete(live[2].session_id)
+    assert store.memory_bytes() == 0
+
+
+def test_create_and_edit_cost_does_not_grow_with_session_count(ml_model, clock, monkeypatch):
+    sizes = ScoringSession.nbytes
+    reads = []
+    monkeypatch.setattr(ScoringSession, "nbytes", property(lambda s: reads.append(1) or sizes.fget(s)))
+
+    store = SessionStore(ttl_seconds=60, max_bytes=1 << 30, max_chars=2000)
+    for _ in range(500):
+        store.create("default", ml_model, ["python"])
+    reads.clear()
+    session = store.create("default", ml_model, ["sql"])
+    session.update(add=["docker"])
+    store.enforce_cap(session)
+    store.memory_bytes()
+    assert len(reads) <= 2                   # the edited session only, never all 501
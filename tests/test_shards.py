@@ -0,0 +1,79 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from backend.ml.model import MLModel
+from benchmark import synthetic_catalog
+
+QUERIES = [
+    "python, sql, machine learning",
+    "react, typescript, css",
+    "docker, kubernetes, tool3",
+    "excel, communication",
+]
+
+
+@pytest.fixture(scope="module")
+def catalog_path():
+    path = synthetic_catalog(300, seed=7)
+    yield path
+    os.unlink(path)
+
+
+@pytest.fixture(scope="module")
+def reference(catalog_path):
+    model = MLModel()
+    model.load(catalog_path, layout="sparse", similar_k=0)
+    return model
+
+
+@pytest.mark.parametrize("layout", ["sparse", "dense"])
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_sharded_scoring_matches_unsharded(catalog_path, reference, executor, layout):
+    model = MLModel()
+    model.load(catalog_path, layout=layout, similar_k=0, shards=4, shard_executor=executor)
+    try:
+        assert model.sharded is not None and len(model.sharded) == 4
+        assert model.layout == layout
+        for q in QUERIES:
+            np.testing.assert_allclose(model.similarity_scores(q), reference.similarity_scores(q), atol=1e-12)
+            idx, scores = model.top_k(q, 10)
+            ref_idx, ref_scores = reference.top_k(q, 10)
+            assert list(idx) == list(ref_idx)
+            np.testing.assert_allclose(scores, ref_scores, atol=1e-12)
+    finally:
+        model.close()
+
+
+def test_top_k_during_close(catalog_path, reference):
+    model = MLModel()
+    model.load(catalog_path, similar_k=0, shards=4, shard_executor="thread")
+    expected = {q: list(reference.top_k(q, 5)[0]) for q in QUERIES}
+    errors, mismatches = [], []
+    start = threading.Barrier(5)
+
+    def query_loop():
+        start.wait()
+        try:
+            for _ in range(50):
+                for q in QUERIES:
+                    if list(model.top_k(q, 5)[0]) != expected[q]:
+                        mismatches.append(q)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=query_loop) for _ in range(4)]
+    for t in threads:
+        t.start()
+    start.wait()
+    model.close()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert mismatches == []
+    assert model.sharded._pools == []
+    # After close, calls score inline and still agree.
+    assert list(model.top_k(QUERIES[0], 5)[0]) == expected[QUERIES[0]]
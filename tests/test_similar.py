@@ -0,0 +1,44 @@
+"""GET /roles/{role}/similar."""
+
+import pytest
+
+from backend.config import settings
+
+
+@pytest.mark.parametrize("path", [
+    "/roles/UI/UX Designer/similar",
+    "/roles/UI%2FUX%20Designer/similar",
+    "/roles/ui/ux designer/similar",
+])
+def test_role_with_slash(client, path):
+    res = client.get(path, params={"k": 3})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["role"] == "UI/UX Designer"
+    assert len(body["similar"]) == 3
+    assert "UI/UX Designer" not in [s["role"] for s in body["similar"]]
+    scores = [s["similarity"] for s in body["similar"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_matches_model_neighbours(client, ml_model):
+    body = client.get("/roles/Data Scientist/similar", params={"k": 2}).json()
+    expected = ml_model.similar_roles("data scientist", k=2)
+    assert [(s["role"], s["similarity"]) for s in body["similar"]] == [
+        (name, round(score, 4)) for name, score in expected
+    ]
+
+
+def test_k_is_capped_at_precomputed_neighbours(client):
+    res = client.get("/roles/UI/UX Designer/similar", params={"k": 20})
+    assert res.status_code == 200
+    assert len(res.json()["similar"]) == settings.similar_roles_k
+    assert client.get("/roles/UI/UX Designer/similar", params={"k": 21}).status_code == 422
+    assert client.get("/roles/UI/UX Designer/similar", params={"k": 0}).status_code == 422
+
+
+@pytest.mark.parametrize("role", ["Astronaut", "UI/UX", "UI/UX Designer/extra"])
+def test_unknown_role(client, role):
+    res = client.get(f"/roles/{role}/similar")
+    assert res.status_code == 404
+    assert "Unknown role" in res.json()["detail"]
@@ -0,0 +1,54 @@
+"""Request tracing: root span naming and the exporter interface."""
+
+import pytest
+
+from backend.tracing import SpanExporter, tracer
+
+
+class _Collector(SpanExporter):
+    def __init__(self) -> None:
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exported(client):
+    saved = (tracer.exporter, tracer.slow_ms, tracer.sample_rate)
+    collector = _Collector()
+    tracer.configure(collector, slow_ms=0.0, sample_rate=0.0)
+    yield collector.spans
+    tracer.configure(*saved)
+
+
+def _roots(spans):
+    return [s for s in spans if s["parentSpanId"] is None]
+
+
+def test_root_span_uses_route_template(client, exported):
+    session_id = client.post("/sessions", json={"skills": ["python", "sql"]}).json()["session_id"]
+    exported.clear()
+    assert client.get(f"/sessions/{session_id}").status_code == 200
+    assert client.get("/roles/UI/UX Designer/similar").status_code == 200
+
+    roots = _roots(exported)
+    assert [r["name"] for r in roots] == ["GET /sessions/{session_id}", "GET /roles/{role:path}/similar"]
+    assert [r["attributes"]["http.route"] for r in roots] == ["/sessions/{session_id}", "/roles/{role:path}/similar"]
+    assert all(session_id not in str(s) and "Designer" not in str(s) for s in exported)
+
+
+def test_unmatched_request_is_named_by_method(client, exported):
+    assert client.get("/no/such/path/secret-value").status_code == 404
+    (root,) = _roots(exported)
+    assert root["name"] == "GET"
+    assert "http.route" not in root["attributes"]
+    assert root["attributes"]["http.status_code"] == 404
+
+
+def test_exporter_must_implement_export():
+    class Incomplete(SpanExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
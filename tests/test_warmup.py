@@ -0,0 +1,195 @@
+"""Query sketch persistence, response cache and budgeted warmup."""
+
+import gc
+import json
+import random
+import time
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from backend.schemas import RecommendRequest
+from backend.warmup import CacheWarmer, QuerySketch, ResponseCache
+
+
+# ── QuerySketch ────────────────────────────────────────────────────────────
+def _zipf_sketch(n_keys: int = 500, n_adds: int = 20_000, **kwargs) -> tuple[QuerySketch, Counter]:
+    rng = random.Random(0)
+    keys = [f"query-{i}" for i in range(n_keys)]
+    weights = [1.0 / (i + 1) for i in range(n_keys)]
+    sketch, exact = QuerySketch(**kwargs), Counter()
+    for key in rng.choices(keys, weights, k=n_adds):
+        sketch.add(key)
+        exact[key] += 1
+    return sketch, exact
+
+
+def test_sketch_never_underestimates():
+    sketch, exact = _zipf_sketch(width=256, depth=4, top_k=20)
+    assert sketch.total == sum(exact.values())
+    for key, count in exact.items():
+        assert sketch.estimate(key) >= count
+
+
+def test_sketch_top_k_finds_the_hottest_keys():
+    sketch, exact = _zipf_sketch(width=2048, depth=4, top_k=50)
+    top = sketch.top()
+    assert len(top) == 50
+    assert [c for _, c in top] == sorted((c for _, c in top), reverse=True)
+    true_top = {k for k, _ in exact.most_common(20)}
+    assert true_top <= {k for k, _ in top}
+
+
+def test_sketch_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "state" / "sketch.json")
+    sketch, _ = _zipf_sketch(width=512, depth=3, top_k=30)
+    sketch.save(path)
+    assert not sketch.dirty
+
+    restored = QuerySketch(width=512, depth=3, top_k=30)
+    restored.load(path)
+    np.testing.assert_array_equal(restored.table, sketch.table)
+    assert restored.total == sketch.total
+    assert restored.top() == sketch.top()
+    assert not restored.dirty
+    # Counting continues from the restored state.
+    key = sketch.top(1)[0][0]
+    assert restored.add(key) == sketch.add(key)
+
+
+def test_sketch_load_ignores_missing_mismatched_or_corrupt_files(tmp_path):
+    sketch, _ = _zipf_sketch(width=512, depth=3, top_k=30)
+    path = tmp_path / "sketch.json"
+    sketch.save(str(path))
+
+    fresh = QuerySketch(width=512, depth=3, top_k=30)
+    fresh.load(str(tmp_path / "missing.json"))
+    assert fresh.total == 0
+
+    other_shape = QuerySketch(width=1024, depth=3, top_k=30)
+    other_shape.load(str(path))
+    assert other_shape.total == 0 and other_shape.top() == []
+
+    path.write_text("{not json")
+    fresh.load(str(path))
+    assert fresh.total == 0
+
+
+def test_sketch_file_keeps_only_top_keys_in_plain_text(tmp_path):
+    sketch = QuerySketch(width=64, depth=2, top_k=2)
+    for i in range(10):
+        sketch.add(f"rare-{i}")
+    for _ in range(5):
+        sketch.add("hot-a")
+        sketch.add("hot-b")
+    path = tmp_path / "sketch.json"
+    sketch.save(str(path))
+    text = path.read_text()
+    assert "hot-a" in text and "hot-b" in text and "rare-" not in text
+
+
+# ── ResponseCache ──────────────────────────────────────────────────────────
+class _Model:
+    """Stand-in for MLModel: the cache only needs a weak-referenceable key."""
+
+
+def test_response_cache_is_lru_per_model():
+    cache = ResponseCache(max_entries=2)
+    m1, m2 = _Model(), _Model()
+    cache.put(m1, "a", 1)
+    cache.put(m1, "b", 2)
+    assert cache.get(m1, "a") == 1            # b is now least recently used
+    cache.put(m1, "c", 3)
+    assert cache.get(m1, "b") is None
+    assert cache.get(m1, "a") == 1 and cache.get(m1, "c") == 3
+    assert cache.get(m2, "a") is None         # entries belong to their model
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_response_cache_drops_entries_with_their_model():
+    cache = ResponseCache(max_entries=4)
+    model = _Model()
+    cache.put(model, "a", 1)
+    assert len(cache._by_model) == 1
+    del model
+    gc.collect()
+    assert len(cache._by_model) == 0
+
+
+def test_response_cache_disabled_with_zero_entries():
+    cache = ResponseCache(max_entries=0)
+    model = _Model()
+    cache.put(model, "a", 1)
+    assert cache.get(model, "a") is None
+
+
+# ── CacheWarmer ────────────────────────────────────────────────────────────
+def test_warmer_runs_every_key_and_counts_failures():
+    warmed = []
+
+    def warm_one(key: str) -> None:
+        if key == "bad":
+            raise ValueError(key)
+        warmed.append(key)
+
+    warmer = CacheWarmer(budget_seconds=10)
+    warmer.start("ds", ["a", "bad", "b"], warm_one)
+    warmer.wait("ds", timeout=5)
+    progress = warmer.progress("ds")
+    assert warmed == ["a", "b"]
+    assert (progress.state, progress.total, progress.completed, progress.failed) == ("done", 3, 2, 1)
+    assert not progress.stopped_by_budget
+
+
+def test_warmer_stops_at_its_time_budget():
+    warmer = CacheWarmer(budget_seconds=0.05)
+    warmer.start("ds", [str(i) for i in range(100)], lambda key: time.sleep(0.02))
+    warmer.wait("ds", timeout=5)
+    progress = warmer.progress("ds")
+    assert progress.state == "done" and progress.stopped_by_budget
+    assert 0 < progress.completed < 100
+
+
+# ── Through the app ────────────────────────────────────────────────────────
+@pytest.fixture
+def app_state(client, monkeypatch):
+    """backend.main with a fresh response cache and query sketch (restored afterwards)."""
+    from backend import main
+
+    monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=64))
+    monkeypatch.setattr(main, "query_sketch", QuerySketch())
+    return main
+
+
+def test_cached_responses_equal_fresh_computation(client, app_state):
+    main = app_state
+    model = main.registry.get(main.settings.default_dataset)
+    variants = ["Python, SQL, Pandas", "python,sql,pandas", "  PYTHON ,  sql , pandas  "]
+    for i, skills in enumerate(variants):
+        body = {"skills": skills, "top_n": 4, "fields": ["match_score", "strengths", "avg_salary"]}
+        res = client.post("/recommend", json=body)
+        assert res.status_code == 200
+        fresh = main._compute_response(RecommendRequest(**body), model)
+        assert res.json() == json.loads(fresh.model_dump_json(exclude_unset=True))
+        assert res.json()["input_skills"] == skills.strip()
+    assert main.response_cache.hits == len(variants) - 1
+
+
+def test_warmup_precomputes_hot_queries_and_reports_progress(client, app_state, monkeypatch):
+    main = app_state
+    name = main.settings.default_dataset
+    for skills in ("react, css", "docker, kubernetes", "excel, sql"):
+        for _ in range(3):
+            client.post("/recommend", json={"skills": skills, "top_n": 3})
+
+    monkeypatch.setattr(main, "response_cache", ResponseCache(max_entries=64))   # as after a reload
+    model = main.registry.get(name)
+    main._start_warmup(name, model)
+    main.warmer.wait(name, timeout=10)
+
+    warmup = client.get("/health").json()["warmup"]
+    assert warmup["state"] == "done" and warmup["completed"] == 3 and warmup["failed"] == 0
+    hits_before = main.response_cache.hits
+    client.post("/recommend", json={"skills": "Docker, Kubernetes", "top_n": 3})
+    assert main.response_cache.hits == hits_before + 1
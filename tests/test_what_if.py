@@ -0,0 +1,35 @@
+"""POST /recommend/what-if agrees with /recommend."""
+
+import pytest
+
+
+def _recommend_score(client, skills: str, role: str) -> float:
+    res = client.post("/recommend", json={"skills": skills, "top_n": 10, "fields": ["match_score"]})
+    assert res.status_code == 200
+    scores = {r["role"]: r["match_score"] for r in res.json()["recommendations"]}
+    assert role in scores, f"{role} not in the top 10 for {skills!r}"
+    return scores[role]
+
+
+@pytest.mark.parametrize("skills, role", [
+    ("python, statistics", "Data Scientist"),
+    ("figma, css", "UI/UX Designer"),
+])
+def test_candidate_scores_match_recommend(client, skills, role):
+    res = client.post("/recommend/what-if", json={"skills": skills, "role": role, "limit": 5})
+    assert res.status_code == 200
+    body = res.json()
+    assert body["role"] == role
+    assert body["current_score"] == _recommend_score(client, skills, role)
+    assert body["candidates"]
+    uplifts = [c["uplift"] for c in body["candidates"]]
+    assert uplifts == sorted(uplifts, reverse=True)
+    for c in body["candidates"]:
+        assert c["match_score"] == _recommend_score(client, f"{skills}, {c['skill']}", role)
+        assert c["uplift"] == round(c["match_score"] - body["current_score"], 1)
+
+
+def test_unknown_role(client):
+    res = client.post("/recommend/what-if", json={"skills": "python, sql", "role": "Astronaut"})
+    assert res.status_code == 404
+    assert "Unknown role" in res.json()["detail"]